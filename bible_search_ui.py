@@ -11,6 +11,7 @@ from search_utils import (
     get_form_occurrences,
     get_form_occurrences_any,
     build_form_occurrence_index,
+    build_form_hits_index,
 )
 from verb_inflector import conjugate_verb, find_lexicon_root_for_form
 from noun_inflector import inflect_noun, NOUNS, find_noun_lemma_for_form, build_noun_forms_index
@@ -131,11 +132,11 @@ def classify_inflection_reason_struct(verse_text: str, form_ps: str) -> list:
 
 
 # --- Unicode Normalization ---
+# Arabic Yeh, Alef Maksura and Yeh with Hamza Above -> Farsi Yeh
+YEH_TABLE = str.maketrans({'ي': 'ی', 'ى': 'ی', 'ئ': 'ی'})
+
 def normalize_pashto_char(text):
-    replacements = {'ي': 'ی', 'ى': 'ی', 'ئ': 'ی'}
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    return text
+    return text.translate(YEH_TABLE)
 
 # --- Configuration & Data Loading (Robust Paths) ---
 APP_ROOT = os.path.dirname(os.path.abspath(__file__))
@@ -625,6 +626,16 @@ def create_form_to_root_map(_grammatical_index):
                          form_map[normalized_form].append(root)
     return form_map
 
+@st.cache_data
+def create_form_occurrence_index(_grammatical_index):
+    return build_form_occurrence_index(_grammatical_index)
+
+# cache_resource, not cache_data: the hits reference the index's own dicts,
+# and a per-call unpickled copy would cost as much as rebuilding them
+@st.cache_resource
+def create_form_hits_index(_grammatical_index):
+    return build_form_hits_index(_grammatical_index)
+
 # --- UI Helper Functions ---
 def format_for_display(word):
     return word.replace("_", " ")
@@ -853,7 +864,7 @@ def handle_grammatical_search(query, form_to_root_map, grammatical_index, nt_tex
 
     # Then show grammatical results for the root (if form maps to a root), otherwise for the form itself
     effective_query = lex_root if lex_root else query
-    results = search_grammatical_forms(effective_query, form_to_root_map, grammatical_index)
+    results = search_grammatical_forms(effective_query, form_to_root_map, grammatical_index, create_form_hits_index(grammatical_index))
 
     # If no results from index but we have a lexicon root, still render a conjugation summary
     if not results and lex_root:
@@ -1054,6 +1065,9 @@ def _clear_all_caches():
         _build_dict_norm_map,
         build_dictionary_dataframe,
         build_bible_word_catalog,
+        create_form_to_root_map,
+        create_form_occurrence_index,
+        create_form_hits_index,
     ]:
         try:
             fn.clear()
@@ -1077,7 +1091,7 @@ with tabs[0]:
     if grammatical_index is None: st.stop()
 
     form_to_root_map = create_form_to_root_map(grammatical_index)
-    form_occurrence_index = build_form_occurrence_index(grammatical_index)
+    form_occurrence_index = create_form_occurrence_index(grammatical_index)
     # Overlay OT-only occurrences when browsing OT to ensure fast per-form lookups
     if scope == "Old Testament" and os.path.exists(OT_FORMS_INDEX_FILE):
         try:
@@ -31,11 +31,11 @@ DICT_PATH = os.path.join(APP_ROOT, 'full_dictionary.json')
 OUT_PATH = os.path.join(APP_ROOT, 'nt_reference.json')
 
 
+# Arabic Yeh, Alef Maksura and Yeh with Hamza Above -> Farsi Yeh
+YEH_TABLE = str.maketrans({'ي': 'ی', 'ى': 'ی', 'ئ': 'ی'})
+
 def normalize_pashto_char(text: str) -> str:
-    replacements = {'ي': 'ی', 'ى': 'ی', 'ئ': 'ی'}
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    return text
+    return text.translate(YEH_TABLE)
 
 
 def load_dictionary_map() -> Dict[str, List[dict]]:
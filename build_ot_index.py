@@ -9,11 +9,15 @@ OUT_FREQ = os.path.join(APP_ROOT, 'ot_word_frequency_list.json')
 OUT_FORMS = os.path.join(APP_ROOT, 'ot_form_occurrence_index.json')
 
 
+# Arabic Yeh, Alef Maksura and Yeh with Hamza Above -> Farsi Yeh
+YEH_TABLE = str.maketrans({'ي': 'ی', 'ى': 'ی', 'ئ': 'ی'})
+
 def normalize_pashto_char(text: str) -> str:
-    replacements = {'ي': 'ی', 'ى': 'ی', 'ئ': 'ی'}
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    return text
+    return text.translate(YEH_TABLE)
+
+
+# A verse line starts with its number (Western, Arabic-Indic or Persian digits)
+VERSE_LINE_RE = re.compile(r'^([0-9\u0660-\u0669\u06F0-\u06F9]+)\s*(.*)$')
 
 
 def load_ot_bible(dir_path: str) -> dict:
@@ -57,13 +61,14 @@ def load_ot_bible(dir_path: str) -> dict:
         book = book_map.get(book_prefix, book_prefix.capitalize())
         filepath = os.path.join(dir_path, filename)
         with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+            # Normalize the whole chapter in one translate pass, not per line
+            lines = normalize_pashto_char(f.read()).split('\n')
 
         current_verse = None
         verse_text_lines = []
         for line in lines:
-            stripped = normalize_pashto_char(line.rstrip())
-            m = re.match(r'^([0-9\u0660-\u0669\u06F0-\u06F9]+)\s*(.*)$', stripped)
+            stripped = line.rstrip()
+            m = VERSE_LINE_RE.match(stripped)
             verse_num = parse_int_mixed_digits(m.group(1)) if m else None
             if verse_num is not None:
                 if current_verse is not None:
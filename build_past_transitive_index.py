@@ -1,12 +1,20 @@
 import os
 import re
 import json
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Tuple
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
+
+from dictionary_core import load_dictionary_map
+
 APP_ROOT = os.path.dirname(os.path.abspath(__file__))
 NT_DIR = os.path.join(APP_ROOT, 'nt_txt_copies')
 OT_DIR = os.path.join(APP_ROOT, 'ot_txt_copies')
-DICT_PATH = os.path.join(APP_ROOT, 'full_dictionary.json')
 OUT_PATH = os.path.join(APP_ROOT, 'past_transitive_index.json')
 
 # Basic normalization (unify ی variants)
@@ -26,90 +34,90 @@ TRANSITIVE_MARKERS = [
     'ولیک', 'وښ',         # write/show
 ]
 
+@lru_cache(maxsize=65536)
 def normalize(s: str) -> str:
     return s.translate(REPL)
 
 PUNCT = '.,:;!?؟،؛"\'()[]{}“”«»'
+_PUNCT_STRIP = str.maketrans('', '', PUNCT)
+
+
+_ARABIC_INDIC = {ord('٠') + i: str(i) for i in range(10)}  # U+0660..U+0669
+_EASTERN_ARABIC = {ord('۰') + i: str(i) for i in range(10)}  # U+06F0..U+06F9
+_DIGIT_TABLE = {**_ARABIC_INDIC, **_EASTERN_ARABIC}
 
 
 def _parse_int_mixed_digits(s: str):
-    arabic_indic = {ord('٠') + i: str(i) for i in range(10)}  # U+0660..U+0669
-    eastern_arabic = {ord('۰') + i: str(i) for i in range(10)}  # U+06F0..U+06F9
-    normalized = s.translate({**arabic_indic, **eastern_arabic})
-    if not normalized or not all('0' <= ch <= '9' for ch in normalized):
-        return None
+    normalized = s.translate(_DIGIT_TABLE)
+    return int(normalized) if normalized and normalized.isascii() and normalized.isdigit() else None
+
+
+BOOK_MAP = {
+    'acts': 'Acts', 'colossians': 'Colossians', 'ephesians': 'Ephesians', 'galatians': 'Galatians',
+    'hebrews': 'Hebrews', 'james': 'James', 'john': 'John', 'luke': 'Luke', 'mark': 'Mark', 'matthew': 'Matthew',
+    'philippians': 'Philippians', 'romans': 'Romans', '1corinthians': '1 Corinthians', '2corinthians': '2 Corinthians',
+    '1thessalonians': '1 Thessalonians', '2thessalonians': '2 Thessalonians', '1timothy': '1 Timothy', '2timothy': '2 Timothy',
+    'titus': 'Titus', 'philemon': 'Philemon', '1peter': '1 Peter', '2peter': '2 Peter', '1john': '1 John',
+    '2john': '2 John', '3john': '3 John', 'jude': 'Jude', 'revelation': 'Revelation',
+}
+
+# Below this many chapter files, process startup costs more than it saves
+PARALLEL_MIN_FILES = 16
+
+
+def _load_chapter(path: str) -> Dict[str, str]:
+    bible: Dict[str, str] = {}
     try:
-        return int(normalized)
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
     except Exception:
-        return None
+        return bible
+    base = os.path.splitext(os.path.basename(path))[0]
+    chapter_match = re.match(r'([a-zA-Z]+)(\d+)_pashto', base)
+    if not chapter_match:
+        return bible
+    book_key = chapter_match.group(1).lower()
+    chapter = int(chapter_match.group(2))
+    book = BOOK_MAP.get(book_key, book_key.title())
+    prefix = f"{book} {chapter}:"
+    current_verse = None
+    verse_text_lines: List[str] = []
+    for line in lines:
+        stripped = normalize(line.strip())
+        verse_num_candidate = stripped.translate(_PUNCT_STRIP)
+        m = re.match(r'^[0-9\u0660-\u0669\u06F0-\u06F9]+', verse_num_candidate)
+        verse_num = _parse_int_mixed_digits(m.group(0)) if m else None
+        if verse_num is not None:
+            if current_verse is not None:
+                bible[prefix + str(current_verse)] = ' '.join(verse_text_lines).strip()
+            current_verse = verse_num
+            verse_text_lines = [re.sub(r'^\s*\d+\s*', '', stripped)]
+        else:
+            verse_text_lines.append(stripped)
+    if current_verse is not None:
+        bible[prefix + str(current_verse)] = ' '.join(verse_text_lines).strip()
+    return bible
 
 
 def load_text_from_dir(dir_path: str) -> Dict[str, str]:
     bible: Dict[str, str] = {}
     if not os.path.isdir(dir_path):
         return bible
-    punct = PUNCT
-    book_map = {
-        'acts': 'Acts', 'colossians': 'Colossians', 'ephesians': 'Ephesians', 'galatians': 'Galatians',
-        'hebrews': 'Hebrews', 'james': 'James', 'john': 'John', 'luke': 'Luke', 'mark': 'Mark', 'matthew': 'Matthew',
-        'philippians': 'Philippians', 'romans': 'Romans', '1corinthians': '1 Corinthians', '2corinthians': '2 Corinthians',
-        '1thessalonians': '1 Thessalonians', '2thessalonians': '2 Thessalonians', '1timothy': '1 Timothy', '2timothy': '2 Timothy',
-        'titus': 'Titus', 'philemon': 'Philemon', '1peter': '1 Peter', '2peter': '2 Peter', '1john': '1 John',
-        '2john': '2 John', '3john': '3 John', 'jude': 'Jude', 'revelation': 'Revelation',
-    }
-    for fname in sorted(os.listdir(dir_path)):
-        if not fname.endswith('.txt'):
-            continue
-        path = os.path.join(dir_path, fname)
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-        except Exception:
-            continue
-        base = os.path.splitext(fname)[0]
-        chapter_match = re.match(r'([a-zA-Z]+)(\d+)_pashto', base)
-        if not chapter_match:
-            continue
-        book_key = chapter_match.group(1).lower()
-        chapter = int(chapter_match.group(2))
-        book = book_map.get(book_key, book_key.title())
-        current_verse = None
-        verse_text_lines: List[str] = []
-        for line in lines:
-            stripped = normalize(line.strip())
-            verse_num_candidate = stripped.translate(str.maketrans('', '', punct))
-            m = re.match(r'^[0-9\u0660-\u0669\u06F0-\u06F9]+', verse_num_candidate)
-            verse_num = _parse_int_mixed_digits(m.group(0)) if m else None
-            if verse_num is not None:
-                if current_verse is not None:
-                    bible[f"{book} {chapter}:{current_verse}"] = ' '.join(verse_text_lines).strip()
-                current_verse = verse_num
-                verse_text_lines = [re.sub(r'^\s*\d+\s*', '', stripped)]
-            else:
-                verse_text_lines.append(stripped)
-        if current_verse is not None:
-            bible[f"{book} {chapter}:{current_verse}"] = ' '.join(verse_text_lines).strip()
+    # Sorted by name, not os.listdir order, so chapters (and the index
+    # entries built from them) come out in the same order on every filesystem
+    with os.scandir(dir_path) as it:
+        entries = sorted((e for e in it if e.is_file() and e.name.endswith('.txt')), key=lambda e: e.name)
+    paths = [e.path for e in entries]
+    if len(paths) < PARALLEL_MIN_FILES:
+        for part in map(_load_chapter, paths):
+            bible.update(part)
+        return bible
+    with ProcessPoolExecutor() as ex:
+        for part in ex.map(_load_chapter, paths, chunksize=4):
+            bible.update(part)
     return bible
 
 
-def load_dictionary_map() -> Dict[str, List[Dict[str, str]]]:
-    if not os.path.exists(DICT_PATH):
-        return {}
-    try:
-        with open(DICT_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        entries = data.get('entries', []) if isinstance(data, dict) else data
-        out: Dict[str, List[Dict[str, str]]] = {}
-        for ent in entries:
-            p = ent.get('p')
-            if not p:
-                continue
-            out.setdefault(p, []).append(ent)
-        return out
-    except Exception:
-        return {}
-
-
 def guess_pos(token: str, dict_map: Dict[str, List[Dict[str, str]]]) -> str:
     entries = dict_map.get(token) or dict_map.get(normalize(token))
     if not entries:
@@ -181,8 +189,12 @@ def analyze():
                 'probable_subject': subj,
                 'subject_pos': subj_pos or 'unknown',
             })
-    with open(OUT_PATH, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        with open(OUT_PATH, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    else:
+        with open(OUT_PATH, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
     print(f"Wrote {len(results)} entries to {OUT_PATH}")
 
 
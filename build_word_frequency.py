@@ -2,8 +2,14 @@
 import json
 import re
 from collections import Counter
+from operator import itemgetter
 import os
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
+
 def get_bible_text_from_files():
     """
     Reads all .txt files from the 'all_txt_copies' directory and
@@ -49,26 +55,25 @@ def build_word_frequency_list():
     # 4. Calculate word frequency
     word_counts = Counter(words)
 
-    # 5. Create the final list with romanization and part of speech
-    frequency_list = []
-    for word, count in word_counts.items():
-        entry = dictionary_map.get(word)
-        romanization = entry.get('g', 'not_found') if entry else 'not_found'
-        pos = entry.get('t', 'unknown') if entry else 'unknown'
-        
-        frequency_list.append({
+    # 5. Create the final list with romanization and part of speech, sorted by frequency
+    get = dictionary_map.get
+    frequency_list = [
+        {
             'pashto': word,
             'frequency': count,
-            'romanization': romanization,
-            'pos': pos
-        })
-
-    # Sort by frequency
-    frequency_list.sort(key=lambda x: x['frequency'], reverse=True)
+            'romanization': entry.get('g', 'not_found') if (entry := get(word)) else 'not_found',
+            'pos': entry.get('t', 'unknown') if entry else 'unknown'
+        }
+        for word, count in sorted(word_counts.items(), key=itemgetter(1), reverse=True)
+    ]
 
     # 6. Save to a new JSON file
-    with open('word_frequency_list.json', 'w', encoding='utf-8') as f:
-        json.dump(frequency_list, f, ensure_ascii=False, indent=4)
+    if orjson is not None:
+        with open('word_frequency_list.json', 'wb') as f:
+            f.write(orjson.dumps(frequency_list, option=orjson.OPT_INDENT_2))
+    else:
+        with open('word_frequency_list.json', 'w', encoding='utf-8') as f:
+            json.dump(frequency_list, f, ensure_ascii=False, indent=2)
 
     print(f"Successfully built word_frequency_list.json with {len(frequency_list)} unique words.")
 
@@ -17,12 +17,20 @@ import json
 import os
 import re
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 from typing import Dict, List
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
+
+from dictionary_core import load_dictionary_map
+
 APP_ROOT = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(APP_ROOT, 'all_txt_copies')
 OT_DIR = os.path.join(APP_ROOT, 'ot_txt_copies')
-DICT_PATH = os.path.join(APP_ROOT, 'full_dictionary.json')
 OUT_FREQ = os.path.join(APP_ROOT, 'word_frequency_list.json')
 OUT_REF = os.path.join(APP_ROOT, 'nt_reference.json')
 
@@ -32,29 +40,18 @@ DIACRITICS = ''.join([
     '\u064B', '\u064C', '\u064D', '\u064E', '\u064F', '\u0650', '\u0651', '\u0652',
     '\u0653', '\u0654', '\u0655', '\u0670'
 ])
-DIAC_RE = re.compile(f"[{DIACRITICS}]")
 
 PUNCTUATION = ''.join([
     '.,:;!?', '؟،؛', '"\'\(\)\[\]\{\}', '“”‘’', '«»‹›', '…', '-', '—', '–', '/', '\\', '|' , '·', '•'
 ])
-PUNC_RE = re.compile(f"[{re.escape(PUNCTUATION)}]")
 
-ZWNJ_RE = re.compile('[\u200c\u200d\u0640]')  # ZWNJ, ZWJ, tatweel
+# One C-level pass: ZWNJ, ZWJ, tatweel, punctuation and diacritics are
+# deleted, and Arabic letter variants are harmonized to the Pashto set
+NORMALIZE_TABLE = str.maketrans('يىئك', 'یییک', '\u200c\u200d\u0640' + PUNCTUATION + DIACRITICS)
 
 
 def normalize_word(word: str) -> str:
-    w = word
-    w = ZWNJ_RE.sub('', w)
-    w = PUNC_RE.sub('', w)
-    w = DIAC_RE.sub('', w)
-    # Arabic -> Pashto letter harmonization
-    w = (w
-         .replace('ي', 'ی')
-         .replace('ى', 'ی')
-         .replace('ئ', 'ی')
-         .replace('ك', 'ک')
-         )
-    return w.strip()
+    return word.translate(NORMALIZE_TABLE).strip()
 
 
 TOKEN_RE = re.compile(r"[\u0600-\u06FF]+")
@@ -64,107 +61,128 @@ def tokenize(text: str) -> List[str]:
     return TOKEN_RE.findall(text)
 
 
-def load_dictionary_map() -> Dict[str, List[dict]]:
-    if not os.path.exists(DICT_PATH):
-        return {}
+# Below this many chapter files, process startup costs more than it saves
+PARALLEL_MIN_FILES = 16
+
+
+def iter_text_paths() -> List[str]:
+    paths: List[str] = []
+    for dir_path in [DATA_DIR, OT_DIR]:
+        if not os.path.isdir(dir_path):
+            continue
+        # Sorted by name, not os.listdir order, so equal-count words come out
+        # in the same order on every filesystem
+        with os.scandir(dir_path) as it:
+            entries = sorted((e for e in it if e.is_file() and e.name.endswith('_pashto.txt')), key=lambda e: e.name)
+        paths.extend(e.path for e in entries)
+    return paths
+
+
+def _read_lines(path: str) -> List[str]:
     try:
-        with open(DICT_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        entries = data.get('entries', []) if isinstance(data, dict) else data
-        mp: Dict[str, List[dict]] = {}
-        for ent in entries:
-            p = ent.get('p')
-            if not p:
-                continue
-            mp.setdefault(p, []).append(ent)
-        return mp
+        with open(path, 'r', encoding='utf-8') as f:
+            return [s for s in (line.strip() for line in f) if s]
     except Exception:
-        return {}
+        return []
 
 
 def iter_texts() -> List[str]:
     texts: List[str] = []
-    for dir_path in [DATA_DIR, OT_DIR]:
-        if not os.path.isdir(dir_path):
-            continue
-        for filename in os.listdir(dir_path):
-            if not filename.endswith('_pashto.txt'):
-                continue
-            path = os.path.join(dir_path, filename)
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        s = line.strip()
-                        if s:
-                            texts.append(s)
-            except Exception:
-                continue
+    for path in iter_text_paths():
+        texts.extend(_read_lines(path))
     return texts
 
 
-def rebuild() -> None:
-    dict_map = load_dictionary_map()
-    texts = iter_texts()
-
+def _count_file(path: str) -> Counter[str]:
     counter: Counter[str] = Counter()
-    for t in texts:
+    for t in _read_lines(path):
         for tok in tokenize(t):
             norm = normalize_word(tok)
             if not norm:
                 continue
             counter[norm] += 1
+    return counter
+
+
+def count_words(paths: List[str]) -> Counter[str]:
+    """Count normalized tokens across files, fanning out to worker processes."""
+    counter: Counter[str] = Counter()
+    if len(paths) < PARALLEL_MIN_FILES:
+        for part in map(_count_file, paths):
+            counter.update(part)
+        return counter
+    with ProcessPoolExecutor() as ex:
+        for part in ex.map(_count_file, paths, chunksize=4):
+            counter.update(part)
+    return counter
+
+
+def write_json(path: str, rows: List[dict]) -> None:
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(rows, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+# Tag fields for words with no dictionary entry
+_UNTAGGED = {
+    'romanization': '',
+    'pos': 'unknown',
+    'ts': '',
+    'english': '',
+    'r': None,
+    'a': None,
+    'i': None,
+}
+
+
+def _entry_tags(ent: dict) -> dict:
+    rom = (ent.get('f') or '').split(',')[0].strip()
+    # Normalize POS label to merge minor spacing/punctuation differences
+    raw_pos = ent.get('c', '') or 'unknown'
+    pos = re.sub(r"\s*\.\s*", ".", raw_pos.lower())
+    pos = re.sub(r"\s+/\s+", " / ", pos)
+    pos = re.sub(r"\s+", " ", pos).strip()
+    return {
+        'romanization': rom,
+        'pos': pos,
+        'ts': ent.get('ts', ''),
+        'english': ent.get('e', ''),
+        # Optional clues seen in JSON (r/a/i) – keep as metadata when present
+        'r': ent.get('r'),
+        'a': ent.get('a'),
+        'i': ent.get('i'),
+    }
+
+
+def rebuild() -> None:
+    dict_map = load_dictionary_map()
+    counter = count_words(iter_text_paths())
+
+    get = dict_map.get
+    ranked = sorted(counter.items(), key=itemgetter(1), reverse=True)
+    tags = [_entry_tags(entries[0]) if (entries := get(pashto)) else _UNTAGGED for pashto, _ in ranked]
 
     # Frequency JSON (compact and compatible with the UI)
-    freq_rows: List[dict] = []
-    ref_rows: List[dict] = []
-    for pashto, count in counter.most_common():
-        entries = dict_map.get(pashto) or []
-        if entries:
-            ent = entries[0]
-            rom = (ent.get('f') or '').split(',')[0].strip()
-            # Normalize POS label to merge minor spacing/punctuation differences
-            raw_pos = ent.get('c', '') or 'unknown'
-            pos = re.sub(r"\s*\.\s*", ".", raw_pos.lower())
-            pos = re.sub(r"\s+/\s+", " / ", pos)
-            pos = re.sub(r"\s+", " ", pos).strip()
-            ts = ent.get('ts', '')
-            eng = ent.get('e', '')
-            # Optional clues seen in JSON (r/a/i) – keep as metadata when present
-            r_field = ent.get('r')
-            a_field = ent.get('a')
-            i_field = ent.get('i')
-        else:
-            rom = ''
-            pos = 'unknown'
-            ts = ''
-            eng = ''
-            r_field = a_field = i_field = None
-
-        freq_rows.append({
+    freq_rows: List[dict] = [
+        {
             'pashto': pashto,
             'frequency': count,
-            'romanization': rom,
-            'pos': pos,
-            'english': eng,
-        })
-
-        ref_rows.append({
-            'pashto': pashto,
-            'count': count,
-            'romanization': rom,
-            'pos': pos,
-            'ts': ts,
-            'english': eng,
-            'r': r_field,
-            'a': a_field,
-            'i': i_field,
-        })
-
-    with open(OUT_FREQ, 'w', encoding='utf-8') as f:
-        json.dump(freq_rows, f, ensure_ascii=False, indent=2)
-
-    with open(OUT_REF, 'w', encoding='utf-8') as f:
-        json.dump(ref_rows, f, ensure_ascii=False, indent=2)
+            'romanization': tag['romanization'],
+            'pos': tag['pos'],
+            'english': tag['english'],
+        }
+        for (pashto, count), tag in zip(ranked, tags)
+    ]
+    ref_rows: List[dict] = [
+        {'pashto': pashto, 'count': count, **tag}
+        for (pashto, count), tag in zip(ranked, tags)
+    ]
+
+    write_json(OUT_FREQ, freq_rows)
+    write_json(OUT_REF, ref_rows)
 
     print(f"Wrote {len(freq_rows)} entries to {OUT_FREQ}")
     print(f"Wrote {len(ref_rows)} entries to {OUT_REF}")
@@ -5,22 +5,25 @@ def find_word_in_index(word_to_find, filepath='all_txt_copies/word_index_v4_comp
     Reads the index file line by line and prints any line containing the specified word.
     """
     print(f"Searching for '{word_to_find}' in '{filepath}'...")
+    # The word could be at the beginning of the line
+    exact = re.compile(f'^{re.escape(word_to_find)}\\s')
+    # Looser search for lines containing all of the word's characters
+    loose_chars = set(word_to_find)
     found = False
+    close_matches = []
     with open(filepath, 'r', encoding='utf-8') as f:
         for i, line in enumerate(f):
-            # The word could be at the beginning of the line
-            if re.search(f'^{re.escape(word_to_find)}\s', line):
+            if exact.search(line):
                 print(f"Found exact match on line {i+1}: {line.strip()}")
                 found = True
-    
+            elif not found and loose_chars.issubset(line):
+                close_matches.append((i, line))
+
     if not found:
         print(f"\nCould not find an exact match for '{word_to_find}'.")
         print("Searching for close matches (words containing the letters)...")
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for i, line in enumerate(f):
-                 # Looser search for lines containing the characters
-                if 'م' in line and 'ې' in line and 'ن' in line and 'ځ' in line:
-                    print(f"Found potential close match on line {i+1}: {line.strip()}")
+        for i, line in close_matches:
+            print(f"Found potential close match on line {i+1}: {line.strip()}")
 
 
 find_word_in_index("مېنځ")
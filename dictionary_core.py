@@ -0,0 +1,79 @@
+"""full_dictionary.json loading shared by build_past_transitive_index.py and clean_and_rebuild_frequency.py."""
+
+import json
+import os
+import pickle
+from typing import Dict, List
+
+try:
+    import ijson
+except ImportError:  # optional; fall back to json.load
+    ijson = None
+
+APP_ROOT = os.path.dirname(os.path.abspath(__file__))
+DICT_PATH = os.path.join(APP_ROOT, 'full_dictionary.json')
+DICT_CACHE_PATH = os.path.join(APP_ROOT, 'full_dictionary.pkl')
+
+
+def _load_dictionary_cache():
+    """Return the pickled dictionary map if it is newer than the JSON source."""
+    try:
+        if os.path.getmtime(DICT_CACHE_PATH) < os.path.getmtime(DICT_PATH):
+            return None
+        with open(DICT_CACHE_PATH, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def _save_dictionary_cache(mp) -> None:
+    """Pickle the dictionary map next to the JSON source, swapping it in atomically."""
+    # The cache only saves a reparse, so a failed write is reported, not fatal
+    tmp_path = DICT_CACHE_PATH + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(mp, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, DICT_CACHE_PATH)
+    except (OSError, pickle.PicklingError) as e:
+        print(f"Warning: could not write {DICT_CACHE_PATH}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _iter_dictionary_entries():
+    """Yield dictionary entries, streaming them with ijson when it is installed.
+
+    The source is either {"entries": [...]} or a bare list of entries.
+    """
+    if ijson is None:
+        with open(DICT_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        yield from (data.get('entries', []) if isinstance(data, dict) else data)
+        return
+    with open(DICT_PATH, 'rb') as f:
+        head = f.read(64).lstrip()
+        f.seek(0)
+        prefix = 'item' if head.startswith(b'[') else 'entries.item'
+        yield from ijson.items(f, prefix, use_float=True)
+
+
+def load_dictionary_map() -> Dict[str, List[Dict[str, str]]]:
+    """Map each Pashto headword ('p') to its dictionary entries, in source order."""
+    if not os.path.exists(DICT_PATH):
+        return {}
+    cached = _load_dictionary_cache()
+    if cached is not None:
+        return cached
+    try:
+        out: Dict[str, List[Dict[str, str]]] = {}
+        for ent in _iter_dictionary_entries():
+            p = ent.get('p')
+            if not p:
+                continue
+            out.setdefault(p, []).append(ent)
+        _save_dictionary_cache(out)
+        return out
+    except Exception:
+        return {}
@@ -9,13 +9,18 @@ verb_suffixes = ['ول', 'وي', 'ېد', 'و', 'ې', 'ي', 'ېده', 'وو']
 noun_suffixes = ['ه', 'ې', 'و', 'ګانې', 'ان']
 all_suffixes = verb_suffixes + noun_suffixes
 
+# Suffix -> POS lookup, probed once per distinct suffix length (longest first)
+suffix_pos = {suf: ('verb' if suf in verb_suffixes else 'noun') for suf in all_suffixes}
+suffix_lengths = sorted({len(suf) for suf in all_suffixes}, reverse=True)
+
 def infer_root_and_pos(word):
-    for suf in sorted(all_suffixes, key=len, reverse=True):
-        if word.endswith(suf):
-            root = word[:-len(suf)]
-            if len(root) >= 2:
-                pos = 'verb' if suf in verb_suffixes else 'noun'
-                return root, pos, suf
+    for n in suffix_lengths:
+        if len(word) - n < 2:
+            continue
+        suf = word[-n:]
+        pos = suffix_pos.get(suf)
+        if pos is not None:
+            return word[:-n], pos, suf
     return word, 'other', ''
 
 # Load original index
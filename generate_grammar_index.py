@@ -2,22 +2,12 @@ import json
 import re
 from collections import defaultdict
 
+from grammar_core import load_word_data, write_json
+
 # Based on https://grammar.lingdocs.com/inflection/inflection-patterns/
 # This script attempts to programmatically apply the described inflection patterns
 # to group words under a common root.
 
-def load_word_data(filepath='all_txt_copies/word_index.txt'):
-    """Loads the flat word index into a dictionary."""
-    word_data = {}
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-            if match:
-                word, count, refs_str = match.groups()
-                refs = refs_str.split(', ')
-                word_data[word] = {'count': int(count), 'verses': refs}
-    return word_data
-
 def apply_patterns(all_words):
     """
     Applies inflection patterns to map each word to its potential root.
@@ -98,7 +88,7 @@ def get_inflection_details(word, root, all_words):
 # --- Main Execution ---
 
 # 1. Load all word data and get a set of unique words
-word_data = load_word_data()
+word_data = load_word_data('all_txt_copies/word_index.txt')
 all_words_set = set(word_data.keys())
 
 # 2. Apply inflection patterns to generate a root map
@@ -127,8 +117,7 @@ for word, data in word_data.items():
 
 # 4. Save the new grammatical index to a JSON file
 output_path = 'all_txt_copies/grammatical_index.json'
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(grammatical_index, f, ensure_ascii=False, indent=2)
+write_json(output_path, grammatical_index)
 
 print(f"New grammatical index created at: {output_path}")
 
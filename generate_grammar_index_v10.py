@@ -1,6 +1,7 @@
-import json
-import re
 from collections import defaultdict
+from functools import lru_cache
+
+from grammar_core import load_word_data, write_json
 
 # --- Definitive Grammar Configuration ---
 VERB_LEXICON = {
@@ -21,35 +22,45 @@ VERB_LEXICON = {
     },
 }
 
-def load_word_data(filepath='all_txt_copies/word_index_v10_final.txt'):
-    word_data = {}
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-            if match:
-                word, count, refs_str = match.groups()
-                word_data[word] = {'count': int(count), 'verses': refs_str.split(', ')}
-    return word_data
+# Flat (stem, root, details) list, built once: lexicon order, longest stem first per root
+VERB_STEMS_SORTED = tuple(
+    (stem, root, details)
+    for root, details in VERB_LEXICON.items()
+    for stem in sorted(details['stems'].values(), key=len, reverse=True)
+)
+# The same stems bucketed by their first character (order kept), so a word is
+# only tested against stems it could possibly start with
+STEMS_BY_FIRST = {}
+for entry in VERB_STEMS_SORTED:
+    STEMS_BY_FIRST.setdefault(entry[0][0], []).append(entry)
+
+@lru_cache(maxsize=None)
+def find_root_and_details_final(word):
+    """The final, definitive, stem-aware grammar engine.
 
-def find_root_and_details_final(word, all_words_set):
-    """The final, definitive, stem-aware grammar engine."""
+    Returns (root, type, pattern_info, form_description). Memoized per word;
+    reads the module-level all_words_set built in the main section.
+    """
     
     if word in VERB_LEXICON:
-         return word, { 'type': 'Verb', 'pattern_info': VERB_LEXICON[word]['pattern_info'], 'form_description': 'Infinitive Root' }
+         return word, 'Verb', VERB_LEXICON[word]['pattern_info'], 'Infinitive Root'
 
-    for root, details in VERB_LEXICON.items():
-        sorted_stems = sorted(details['stems'].values(), key=len, reverse=True)
-        for stem in sorted_stems:
-            if word.startswith(stem):
-                return root, { 'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': f"Derived from stem '{stem}'" }
+    for stem, root, details in STEMS_BY_FIRST.get(word[:1], ()):
+        if word.startswith(stem):
+            return root, 'Verb', details['pattern_info'], f"Derived from stem '{stem}'"
 
-    if word.endswith(('ي', 'یو', 'یه')):
-        potential_root = re.sub(r'(ي|یو|یه)$', '', word) + 'ی'
-        if potential_root in all_words_set:
-            inf_type = "1st Inflection (Masc)" if word.endswith('ي') else "2nd Inflection (Masc)" if word.endswith('یو') else "Vocative (Masc)"
-            return potential_root, { 'type': 'Noun/Adj', 'pattern_info': 'Pattern 2: Unstressed ی', 'form_description': inf_type }
+    if word.endswith('ي'):
+        potential_root, inf_type = word[:-1] + 'ی', "1st Inflection (Masc)"
+    elif word.endswith('یو'):
+        potential_root, inf_type = word[:-2] + 'ی', "2nd Inflection (Masc)"
+    elif word.endswith('یه'):
+        potential_root, inf_type = word[:-2] + 'ی', "Vocative (Masc)"
+    else:
+        potential_root = None
+    if potential_root is not None and potential_root in all_words_set:
+        return potential_root, 'Noun/Adj', 'Pattern 2: Unstressed ی', inf_type
             
-    return word, { 'type': 'Noun/Adj', 'pattern_info': 'N/A', 'form_description': 'Base Form' }
+    return word, 'Noun/Adj', 'N/A', 'Base Form'
 
 # --- Main Execution ---
 word_data = load_word_data()
@@ -57,21 +68,20 @@ all_words_set = set(word_data.keys())
 final_index = defaultdict(lambda: {'forms': defaultdict(list)})
 
 for word, data in word_data.items():
-    root, details = find_root_and_details_final(word, all_words_set)
+    root, _, _, form_description = find_root_and_details_final(word)
     
     if root in VERB_LEXICON:
         final_index[root]['type'] = VERB_LEXICON[root]['type']
         final_index[root]['pattern_info'] = VERB_LEXICON[root]['pattern_info']
     else:
-        _, root_details = find_root_and_details_final(root, all_words_set)
-        final_index[root]['type'] = root_details['type']
-        final_index[root]['pattern_info'] = root_details['pattern_info']
+        _, root_type, root_pattern_info, _ = find_root_and_details_final(root)
+        final_index[root]['type'] = root_type
+        final_index[root]['pattern_info'] = root_pattern_info
     
-    final_index[root]['forms'][details['form_description']].append({ 'form': word, 'count': data['count'], 'verses': data['verses'] })
+    final_index[root]['forms'][form_description].append({ 'form': word, 'count': data['count'], 'verses': data['verses'] })
 
 output_path = 'all_txt_copies/grammatical_index_v10.json'
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(final_index, f, ensure_ascii=False, indent=2)
+write_json(output_path, final_index)
 
 print(f"Definitive grammatical index created at: {output_path}")
 
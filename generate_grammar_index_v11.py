@@ -1,6 +1,7 @@
-import json
-import re
 from collections import defaultdict
+from functools import lru_cache
+
+from grammar_core import build_trie, load_word_data, write_json
 
 # --- Expanded Verb Lexicon ---
 VERB_LEXICON = {
@@ -72,78 +73,130 @@ IRREGULAR_NOUN_ADJ_LEXICON = {
     # Shorter words (Pattern 5) could also be added if needed
 }
 
-def load_word_data(filepath='all_txt_copies/word_index_v10_final.txt'):
-    word_data = {}
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-            if match:
-                word, count, refs_str = match.groups()
-                word_data[word] = {'count': int(count), 'verses': refs_str.split(', ')}
-    return word_data
-
-def find_root_and_details_final(word, all_words_set):
-    """Expanded definitive stem-aware grammar engine with more inflection patterns."""
-    
-    # Verb Check (unchanged)
-    if word in VERB_LEXICON:
-        return word, { 'type': 'Verb', 'pattern_info': VERB_LEXICON[word]['pattern_info'], 'form_description': 'Infinitive Root' }
-
-    for root, details in VERB_LEXICON.items():
-        sorted_stems = sorted(details['stems'].values(), key=len, reverse=True)
-        for stem in sorted_stems:
-            if word.startswith(stem):
-                return root, { 'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': f"Derived from stem '{stem}'" }
-
-    # Check irregular noun/adj lexicon first
-    for root, details in IRREGULAR_NOUN_ADJ_LEXICON.items():
-        if word in details['inflected_forms']:
-            form_desc = f"Inflected form of '{root}'"
-            return root, { 'type': details['type'], 'pattern_info': details['pattern_info'], 'form_description': form_desc }
-
-    # Expanded Noun/Adj Patterns (priority order: specific to general)
-    
+# Inflected form -> (root, details); the first root listing a form wins
+IRREGULAR_FORMS = {}
+for root, details in IRREGULAR_NOUN_ADJ_LEXICON.items():
+    for form in details['inflected_forms']:
+        IRREGULAR_FORMS.setdefault(form, (root, details))
+
+# Verb stems keyed by their leading characters. A word matching several stems
+# resolves to the earliest root in VERB_LEXICON, then to its longest stem.
+STEM_TRIE = build_trie(
+    (stem, ((rank, -len(stem)), stem, root, details))
+    for rank, (root, details) in enumerate(VERB_LEXICON.items())
+    for stem in set(details['stems'].values())
+)
+
+def match_verb_stem(word):
+    node, best = STEM_TRIE, None
+    for ch in word:
+        node = node.get(ch)
+        if node is None:
+            break
+        for hit in node.get(None, ()):
+            if best is None or hit[0] < best[0]:
+                best = hit
+    return best
+
+# --- Noun/Adj suffix handlers (each returns (root, details) or None) ---
+# Root checks go straight to all_words_set: a miss is one hash and one probe in
+# C, which no pure-Python prefilter (e.g. a Bloom filter) can undercut.
+
+def stressed_yeh_plain(word, all_words_set):
     # Pattern 3/Extra: Ends with 'ۍ' (fem plain/1st for stressed ی or inanimate ي)
-    if word.endswith('ۍ'):
-        potential_root = re.sub(r'ۍ$', 'ی', word)
-        if potential_root in all_words_set:
-            return potential_root, { 'type': 'Noun/Adj', 'pattern_info': 'Pattern 3: Stressed ی or Extra inanimate', 'form_description': 'Plain/1st (Fem)' }
+    potential_root = word[:-1] + 'ی'
+    if potential_root in all_words_set:
+        return potential_root, 'Noun/Adj', 'Pattern 3: Stressed ی or Extra inanimate', 'Plain/1st (Fem)'
 
+def inanimate_fem_second(word, all_words_set):
     # Extra pattern: 2nd inflection 'یو' for inanimate fem, root ends with 'ي'
-    if word.endswith('یو'):
-        potential_root_extra = re.sub(r'یو$', 'ي', word)
-        if potential_root_extra in all_words_set:
-            return potential_root_extra, { 'type': 'Noun/Adj', 'pattern_info': 'Extra: Inanimate fem ي', 'form_description': '2nd Inflection' }
+    potential_root_extra = word[:-2] + 'ي'
+    if potential_root_extra in all_words_set:
+        return potential_root_extra, 'Noun/Adj', 'Extra: Inanimate fem ي', '2nd Inflection'
 
+def unstressed_y_inflection(suffix, inf_type):
     # Existing Pattern 2/3: Ends with 'ي', 'یو', 'یه' (now distinguishing vocative if applicable)
-    if word.endswith(('ي', 'یو', 'یه')):
-        potential_root = re.sub(r'(ي|یو|یه)$', '', word) + 'ی'
+    pattern_info = 'Pattern 2: Unstressed ی' if inf_type != 'Vocative (Masc)' else 'Vocative Form'
+    def handler(word, all_words_set):
+        potential_root = word[:-len(suffix)] + 'ی'
         if potential_root in all_words_set:
-            inf_type = "1st Inflection (Masc)" if word.endswith('ي') else "2nd Inflection (Masc)" if word.endswith('یو') else "Vocative (Masc)"
-            pattern_info = 'Pattern 2: Unstressed ی' if inf_type != 'Vocative (Masc)' else 'Vocative Form'
-            return potential_root, { 'type': 'Noun/Adj', 'pattern_info': pattern_info, 'form_description': inf_type }
+            return potential_root, 'Noun/Adj', pattern_info, inf_type
+    return handler
 
+def basic_fem_first(word, all_words_set):
     # Pattern 1: Ends with 'ې' (fem 1st)
-    if word.endswith('ې'):
-        potential_root = re.sub(r'ې$', 'ه', word)
-        if potential_root in all_words_set:
-            return potential_root, { 'type': 'Noun/Adj', 'pattern_info': 'Pattern 1: Basic', 'form_description': '1st Inflection (Fem)' }
+    potential_root = word[:-1] + 'ه'
+    if potential_root in all_words_set:
+        return potential_root, 'Noun/Adj', 'Pattern 1: Basic', '1st Inflection (Fem)'
 
+def basic_second(word, all_words_set):
     # Pattern 1/5: Ends with 'و' (2nd inflection)
-    if word.endswith('و'):
-        potential_root = word[:-1]
-        if potential_root in all_words_set and (potential_root.endswith(('ټ', 'ډ', 'ړ', 'ګ', 'ښ')) or len(potential_root) < 4):  # Rough check for basic or short
-            pattern = 'Pattern 1: Basic' if not potential_root.endswith(('ل', 'ر')) else 'Pattern 5: Shorter words'  # Heuristic for short
-            return potential_root, { 'type': 'Noun/Adj', 'pattern_info': pattern, 'form_description': '2nd Inflection' }
+    potential_root = word[:-1]
+    if potential_root in all_words_set and (potential_root.endswith(('ټ', 'ډ', 'ړ', 'ګ', 'ښ')) or len(potential_root) < 4):  # Rough check for basic or short
+        pattern = 'Pattern 1: Basic' if not potential_root.endswith(('ل', 'ر')) else 'Pattern 5: Shorter words'  # Heuristic for short
+        return potential_root, 'Noun/Adj', pattern, '2nd Inflection'
 
+def short_masc_first(word, all_words_set):
     # Pattern 5: Ends with 'ه' (masc 1st for squish, heuristic for short words)
-    if word.endswith('ه') and len(word) < 5:  # Short word heuristic
+    if len(word) < 5:  # Short word heuristic
         potential_root = word[:-1]
         if potential_root in all_words_set:
-            return potential_root, { 'type': 'Noun/Adj', 'pattern_info': 'Pattern 5: Shorter words', 'form_description': '1st Inflection (Masc)' }
+            return potential_root, 'Noun/Adj', 'Pattern 5: Shorter words', '1st Inflection (Masc)'
+
+# Handlers keyed by the suffix they strip; handlers for the same suffix run in
+# priority order. A word probes its last SUFFIX_MAX_LEN characters, then shorter.
+SUFFIX_DISPATCH = {}
+for suffix, handler in [
+    ('ۍ', stressed_yeh_plain),
+    ('یو', inanimate_fem_second),
+    ('ي', unstressed_y_inflection('ي', '1st Inflection (Masc)')),
+    ('یو', unstressed_y_inflection('یو', '2nd Inflection (Masc)')),
+    ('یه', unstressed_y_inflection('یه', 'Vocative (Masc)')),
+    ('ې', basic_fem_first),
+    ('و', basic_second),
+    ('ه', short_masc_first),
+]:
+    SUFFIX_DISPATCH.setdefault(suffix, []).append(handler)
+SUFFIX_MAX_LEN = max(map(len, SUFFIX_DISPATCH))
+
+def match_noun_suffixes(word):
+    """Return the handlers for every suffix of word, longest suffix first."""
+    return [handler
+            for n in range(min(len(word), SUFFIX_MAX_LEN), 0, -1)
+            for handler in SUFFIX_DISPATCH.get(word[-n:], ())]
+
+@lru_cache(maxsize=None)
+def find_root_and_details_final(word):
+    """Expanded definitive stem-aware grammar engine with more inflection patterns.
+
+    Returns (root, type, pattern_info, form_description). Memoized per word;
+    reads the module-level all_words_set built in the main section.
+    """
+    
+    # Verb Check (unchanged)
+    if word in VERB_LEXICON:
+        return word, 'Verb', VERB_LEXICON[word]['pattern_info'], 'Infinitive Root'
+
+    hit = match_verb_stem(word)
+    if hit is not None:
+        _, stem, root, details = hit
+        return root, 'Verb', details['pattern_info'], f"Derived from stem '{stem}'"
+
+    # Check irregular noun/adj lexicon first
+    irregular = IRREGULAR_FORMS.get(word)
+    if irregular is not None:
+        root, details = irregular
+        form_desc = f"Inflected form of '{root}'"
+        return root, details['type'], details['pattern_info'], form_desc
+
+    # Expanded Noun/Adj Patterns (priority order: longest suffix, then specific to general)
+    for handler in match_noun_suffixes(word):
+        result = handler(word, all_words_set)
+        if result is not None:
+            return result
 
     # Fallback for base forms or uninflected
-    return word, { 'type': 'Noun/Adj', 'pattern_info': 'N/A', 'form_description': 'Base Form' }
+    return word, 'Noun/Adj', 'N/A', 'Base Form'
 
 # --- Main Execution ---
 word_data = load_word_data()
@@ -151,7 +204,7 @@ all_words_set = set(word_data.keys())
 final_index = defaultdict(lambda: {'forms': defaultdict(list)})
 
 for word, data in word_data.items():
-    root, details = find_root_and_details_final(word, all_words_set)
+    root, _, _, form_description = find_root_and_details_final(word)
     
     if root in VERB_LEXICON:
         final_index[root]['type'] = VERB_LEXICON[root]['type']
@@ -160,15 +213,14 @@ for word, data in word_data.items():
         final_index[root]['type'] = IRREGULAR_NOUN_ADJ_LEXICON[root]['type']
         final_index[root]['pattern_info'] = IRREGULAR_NOUN_ADJ_LEXICON[root]['pattern_info']
     else:
-        _, root_details = find_root_and_details_final(root, all_words_set)
-        final_index[root]['type'] = root_details['type']
-        final_index[root]['pattern_info'] = root_details['pattern_info']
+        _, root_type, root_pattern_info, _ = find_root_and_details_final(root)
+        final_index[root]['type'] = root_type
+        final_index[root]['pattern_info'] = root_pattern_info
     
-    final_index[root]['forms'][details['form_description']].append({ 'form': word, 'count': data['count'], 'verses': data['verses'] })
+    final_index[root]['forms'][form_description].append({ 'form': word, 'count': data['count'], 'verses': data['verses'] })
 
 output_path = 'all_txt_copies/grammatical_index_v11.json'  # Updated version
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(final_index, f, ensure_ascii=False, indent=2)
+write_json(output_path, final_index)
 
 print(f"Expanded grammatical index created at: {output_path}")
 
@@ -1,6 +1,9 @@
-import json
-import re
-from collections import defaultdict
+import sys
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+
+from grammar_core import build_trie, forms_to_dicts, load_word_data, prefix_hits, write_json
 
 # --- Expanded Verb Lexicon (v12) ---
 VERB_LEXICON = {
@@ -59,20 +62,40 @@ IRREGULAR_NOUN_ADJ_LEXICON = {
     },
 }
 
-def load_word_data(filepath='all_txt_copies/word_index_v10_final.txt'):
-    word_data = {}
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-            if match:
-                word, count, refs_str = match.groups()
-                word_data[word] = {'count': int(count), 'verses': refs_str.split(', ')}
-    return word_data
-
-def find_all_possible_roots(word, all_words_set):
+# Verb stems keyed by their leading characters, built once at import; each hit
+# carries its interned form description so matching allocates no labels
+STEM_TRIE = build_trie(
+    (stem, ((rank, -len(stem)), root, details, sys.intern(f"Derived from stem '{stem}'")))
+    for rank, (root, details) in enumerate(VERB_LEXICON.items())
+    for stem in set(details['stems'].values())
+)
+
+def match_verb_forms(word):
+    """Return (root, details, form_description) for every stem word starts with: lexicon order, longest stem first per root."""
+    hits = prefix_hits(STEM_TRIE, word)
+    hits.sort(key=itemgetter(0))
+    return [hit[1:] for hit in hits]
+
+# Root -> pattern_info for every lexicon root; a verb entry wins over a noun/adj one
+ROOT_PATTERN = {
+    root: details['pattern_info']
+    for root, details in chain(IRREGULAR_NOUN_ADJ_LEXICON.items(), VERB_LEXICON.items())
+}
+
+# Word -> [(root, details, is_base), ...] in lexicon order: each irregular root
+# is its own base form, and each inflected form points back at its root
+IRREGULAR_FORMS = {}
+for root, details in IRREGULAR_NOUN_ADJ_LEXICON.items():
+    IRREGULAR_FORMS.setdefault(root, []).append((root, details, True))
+    for form in dict.fromkeys(details['inflected_forms']):
+        IRREGULAR_FORMS.setdefault(form, []).append((root, details, False))
+
+@lru_cache(maxsize=None)
+def find_all_possible_roots(word):
     """
     Finds all possible grammatical interpretations of a word (homonym-aware).
-    Returns a list of tuples: [(root, details_dict), ...].
+    Returns a tuple of pairs: ((root, details_dict), ...). Memoized per word;
+    reads the module-level all_words_set built in the main section.
     """
     possible_interpretations = []
     
@@ -83,23 +106,20 @@ def find_all_possible_roots(word, all_words_set):
             word,
             {'type': details['type'], 'pattern_info': details['pattern_info'], 'form_description': 'Infinitive Root'}
         ))
-    for root, details in VERB_LEXICON.items():
-        sorted_stems = sorted(details['stems'].values(), key=len, reverse=True)
-        for stem in sorted_stems:
-            if word.startswith(stem):
-                possible_interpretations.append((
-                    root,
-                    {'type': details['type'], 'pattern_info': details['pattern_info'], 'form_description': f"Derived from stem '{stem}'"}
-                ))
+    for root, details, form_description in match_verb_forms(word):
+        possible_interpretations.append((
+            root,
+            {'type': details['type'], 'pattern_info': details['pattern_info'], 'form_description': form_description}
+        ))
 
     # 2. Noun/Adj Check (Irregular)
-    for root, details in IRREGULAR_NOUN_ADJ_LEXICON.items():
-        if word == root:
+    for root, details, is_base in IRREGULAR_FORMS.get(word, ()):
+        if is_base:
              possible_interpretations.append((
                 root,
                 {'type': details['type'], 'pattern_info': details['pattern_info'], 'form_description': 'Base Form'}
             ))
-        if word in details['inflected_forms']:
+        else:
             possible_interpretations.append((
                 root,
                 {'type': details['type'], 'pattern_info': details['pattern_info'], 'form_description': f"Inflected form of '{root}'"}
@@ -131,6 +151,9 @@ def find_all_possible_roots(word, all_words_set):
             ))
 
     # Remove duplicates - a word might match in multiple ways to the same root/type
+    # Most words have at most one interpretation, so there is nothing to dedupe
+    if len(possible_interpretations) < 2:
+        return tuple(possible_interpretations)
     unique_interpretations = []
     seen = set()
     for r, d in possible_interpretations:
@@ -139,51 +162,46 @@ def find_all_possible_roots(word, all_words_set):
             unique_interpretations.append((r, d))
             seen.add(key)
             
-    return unique_interpretations
+    return tuple(unique_interpretations)
 
 # --- Main Execution ---
 word_data = load_word_data()
 all_words_set = set(word_data.keys())
 # New structure: { root: { "identities": [ {type, pattern, forms...}, ... ] } }
-final_index = defaultdict(lambda: {"identities": []})
+final_index = {}
+# (root, type) -> that identity dict inside final_index[root]["identities"]
+identity_by_key = {}
 
 for word, data in word_data.items():
-    interpretations = find_all_possible_roots(word, all_words_set)
+    interpretations = find_all_possible_roots(word)
     if not interpretations:
         # If no root is found, treat the word itself as the root
         interpretations = [(word, {'type': 'Unknown', 'pattern_info': 'N/A', 'form_description': 'Base Form'})]
     
     for root, details in interpretations:
         # Find if an identity with this type already exists for this root
-        identity = None
-        for id_obj in final_index[root]['identities']:
-            if id_obj['type'] == details['type']:
-                identity = id_obj
-                break
+        key = (root, details['type'])
+        identity = identity_by_key.get(key)
         
         # If no identity of this type exists, create it
         if identity is None:
             # Get pattern info from the root's own identity if available
-            root_details = VERB_LEXICON.get(root) or IRREGULAR_NOUN_ADJ_LEXICON.get(root)
-            pattern_info = root_details['pattern_info'] if root_details else details['pattern_info']
+            pattern_info = ROOT_PATTERN.get(root, details['pattern_info'])
             
             identity = {
                 'type': details['type'],
                 'pattern_info': pattern_info,
-                'forms': defaultdict(list)
+                'forms': {}
             }
-            final_index[root]['identities'].append(identity)
+            final_index.setdefault(root, {'identities': []})['identities'].append(identity)
+            identity_by_key[key] = identity
             
         # Add the current word form to this identity
-        identity['forms'][details['form_description']].append({
-            'form': word,
-            'count': data['count'],
-            'verses': data['verses']
-        })
+        identity['forms'].setdefault(details['form_description'], []).append((word, data['count'], data['verses']))
 
 output_path = 'all_txt_copies/grammatical_index_v12.json'
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(final_index, f, ensure_ascii=False, indent=2)
+forms_to_dicts(final_index)
+write_json(output_path, final_index)
 
 print(f"Homonym-aware grammatical index created at: {output_path}")
 
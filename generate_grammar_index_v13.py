@@ -1,39 +1,9 @@
-import json
-import re
-from collections import defaultdict
-
-# --- Unicode Normalization ---
-def normalize_pashto_char(text):
-    """Replaces different forms of 'yeh' and other chars with a standard one."""
-    replacements = {
-        'ي': 'ی',  # Arabic Yeh to Farsi Yeh
-        'ى': 'ی',  # Alef Maksura to Farsi Yeh
-        'ئ': 'ی',  # Yeh with Hamza Above to Farsi Yeh
-    }
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    return text
-
-# --- Lexicon Normalization ---
-def normalize_lexicon(lexicon):
-    """Normalizes all keys and relevant string values in the lexicon."""
-    normalized_lexicon = {}
-    for key, value in lexicon.items():
-        normalized_key = normalize_pashto_char(key)
-        if isinstance(value, dict):
-            normalized_value = value.copy()
-            if 'stems' in normalized_value:
-                normalized_value['stems'] = {
-                    k: normalize_pashto_char(v) for k, v in normalized_value['stems'].items()
-                }
-            if 'inflected_forms' in normalized_value:
-                normalized_value['inflected_forms'] = [
-                    normalize_pashto_char(form) for form in normalized_value['inflected_forms']
-                ]
-            normalized_lexicon[normalized_key] = normalized_value
-        else:
-            normalized_lexicon[normalized_key] = value
-    return normalized_lexicon
+import sys
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+
+from grammar_core import YEH_TABLE, build_trie, forms_to_dicts, normalize_lexicon, prefix_hits, write_json
 
 # --- Expanded Verb Lexicon (v13 - Normalized) ---
 VERB_LEXICON = normalize_lexicon({
@@ -90,24 +60,66 @@ IRREGULAR_NOUN_ADJ_LEXICON = normalize_lexicon({
     },
 })
 
+# Verb stems keyed by their leading characters, built once at import; each hit
+# carries its interned form description so matching allocates no labels
+STEM_TRIE = build_trie(
+    (stem, ((rank, -len(stem)), root, details, sys.intern(f"Derived from stem '{stem}'")))
+    for rank, (root, details) in enumerate(VERB_LEXICON.items())
+    for stem in set(details['stems'].values())
+)
+
+def match_verb_forms(word):
+    """Return (root, details, form_description) for the longest stem of each root that word starts with, in lexicon order."""
+    hits = prefix_hits(STEM_TRIE, word)
+    hits.sort(key=itemgetter(0))
+    # Interpretations are deduplicated per (root, type), so later hits for a root are never used
+    first_per_root = {}
+    for hit in hits:
+        first_per_root.setdefault(hit[1], hit)
+    return [hit[1:] for hit in first_per_root.values()]
+
+# Root -> pattern_info for every lexicon root; a verb entry wins over a noun/adj one
+ROOT_PATTERN = {
+    root: details['pattern_info']
+    for root, details in chain(IRREGULAR_NOUN_ADJ_LEXICON.items(), VERB_LEXICON.items())
+}
+
+# Word -> [(root, details, is_base), ...] in lexicon order: each irregular root
+# is its own base form, and each inflected form points back at its root
+IRREGULAR_FORMS = {}
+for root, details in IRREGULAR_NOUN_ADJ_LEXICON.items():
+    IRREGULAR_FORMS.setdefault(root, []).append((root, details, True))
+    for form in dict.fromkeys(details['inflected_forms']):
+        IRREGULAR_FORMS.setdefault(form, []).append((root, details, False))
+
 def load_word_data(filepath='all_txt_copies/word_index_v10_final.txt'):
     word_data = {}
     with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-            if match:
-                word, count, refs_str = match.groups()
-                # Normalize word as it's being loaded
-                normalized_word = normalize_pashto_char(word)
-                if normalized_word in word_data:
-                    # If normalized form already exists, merge the data
-                    word_data[normalized_word]['count'] += int(count)
-                    word_data[normalized_word]['verses'].extend(refs_str.split(', '))
-                else:
-                    word_data[normalized_word] = {'count': int(count), 'verses': refs_str.split(', ')}
+        # Refs are plain ASCII, so translating the whole file in one pass
+        # normalizes every word without a per-line call
+        lines = f.read().translate(YEH_TABLE).split('\n')
+    for line in lines:
+        # Lines look like "word (count): ref, ref, ..."
+        head, _, refs_str = line.strip().partition('): ')
+        normalized_word, _, count = head.rpartition(' (')
+        if normalized_word and count.isdigit():
+            # Verses are kept as an insertion-ordered dict of interned refs, so
+            # spellings that normalize to the same word merge without duplicates
+            verses = dict.fromkeys(map(sys.intern, refs_str.split(', ')))
+            if normalized_word in word_data:
+                # If normalized form already exists, merge the data
+                word_data[normalized_word]['count'] += int(count)
+                word_data[normalized_word]['verses'].update(verses)
+            else:
+                word_data[normalized_word] = {'count': int(count), 'verses': verses}
     return word_data
 
-def find_all_possible_roots(word, all_words_set):
+@lru_cache(maxsize=None)
+def find_all_possible_roots(word):
+    """Return every (root, details_dict) interpretation of word as a tuple.
+
+    Memoized per word; reads the module-level all_words_set built in the main section.
+    """
     possible_interpretations = []
     
     # 1. Verb Check
@@ -117,23 +129,20 @@ def find_all_possible_roots(word, all_words_set):
             word,
             {'type': details['type'], 'pattern_info': details['pattern_info'], 'form_description': 'Infinitive Root'}
         ))
-    for root, details in VERB_LEXICON.items():
-        sorted_stems = sorted(details['stems'].values(), key=len, reverse=True)
-        for stem in sorted_stems:
-            if word.startswith(stem):
-                possible_interpretations.append((
-                    root,
-                    {'type': details['type'], 'pattern_info': details['pattern_info'], 'form_description': f"Derived from stem '{stem}'"}
-                ))
+    for root, details, form_description in match_verb_forms(word):
+        possible_interpretations.append((
+            root,
+            {'type': details['type'], 'pattern_info': details['pattern_info'], 'form_description': form_description}
+        ))
 
     # 2. Noun/Adj Check (Irregular)
-    for root, details in IRREGULAR_NOUN_ADJ_LEXICON.items():
-        if word == root:
+    for root, details, is_base in IRREGULAR_FORMS.get(word, ()):
+        if is_base:
              possible_interpretations.append((
                 root,
                 {'type': details['type'], 'pattern_info': details['pattern_info'], 'form_description': 'Base Form'}
             ))
-        if word in details['inflected_forms']:
+        else:
             possible_interpretations.append((
                 root,
                 {'type': details['type'], 'pattern_info': details['pattern_info'], 'form_description': f"Inflected form of '{root}'"}
@@ -151,6 +160,9 @@ def find_all_possible_roots(word, all_words_set):
                 {'type': 'Noun/Adj', 'pattern_info': 'N/A', 'form_description': 'Base Form'}
             ))
 
+    # Most words have at most one interpretation, so there is nothing to dedupe
+    if len(possible_interpretations) < 2:
+        return tuple(possible_interpretations)
     unique_interpretations = []
     seen = set()
     for r, d in possible_interpretations:
@@ -159,43 +171,40 @@ def find_all_possible_roots(word, all_words_set):
             unique_interpretations.append((r, d))
             seen.add(key)
             
-    return unique_interpretations
+    return tuple(unique_interpretations)
 
 # --- Main Execution ---
 word_data = load_word_data()
 all_words_set = set(word_data.keys())
-final_index = defaultdict(lambda: {"identities": []})
+final_index = {}
+# (root, type) -> that identity dict inside final_index[root]["identities"]
+identity_by_key = {}
 
 for word, data in word_data.items():
-    interpretations = find_all_possible_roots(word, all_words_set)
+    # Pop the load-time dict so it is freed as soon as its list exists
+    verses = list(data.pop('verses'))
+    interpretations = find_all_possible_roots(word)
     if not interpretations:
         interpretations = [(word, {'type': 'Unknown', 'pattern_info': 'N/A', 'form_description': 'Base Form'})]
     
     for root, details in interpretations:
-        identity = None
-        for id_obj in final_index[root]['identities']:
-            if id_obj['type'] == details['type']:
-                identity = id_obj
-                break
+        key = (root, details['type'])
+        identity = identity_by_key.get(key)
         
         if identity is None:
-            root_details = VERB_LEXICON.get(root) or IRREGULAR_NOUN_ADJ_LEXICON.get(root)
-            pattern_info = root_details['pattern_info'] if root_details else details['pattern_info']
+            pattern_info = ROOT_PATTERN.get(root, details['pattern_info'])
             identity = {
                 'type': details['type'],
                 'pattern_info': pattern_info,
-                'forms': defaultdict(list)
+                'forms': {}
             }
-            final_index[root]['identities'].append(identity)
+            final_index.setdefault(root, {'identities': []})['identities'].append(identity)
+            identity_by_key[key] = identity
             
-        identity['forms'][details['form_description']].append({
-            'form': word,
-            'count': data['count'],
-            'verses': data['verses']
-        })
+        identity['forms'].setdefault(details['form_description'], []).append((word, data['count'], verses))
 
 output_path = 'all_txt_copies/grammatical_index_v13_normalized.json'
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(final_index, f, ensure_ascii=False, indent=2)
+forms_to_dicts(final_index)
+write_json(output_path, final_index)
 
 print(f"Normalized, homonym-aware grammatical index created at: {output_path}")
@@ -1,30 +1,9 @@
-import json
-import re
-from collections import defaultdict
-
-def normalize_pashto_char(text):
-    """Replaces different forms of 'yeh' and other chars with a standard one."""
-    replacements = {'ي': 'ی', 'ى': 'ی', 'ئ': 'ی'}
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    return text
-
-def normalize_lexicon(lexicon):
-    """Normalizes all keys and relevant string values in the lexicon."""
-    normalized_lexicon = {}
-    for key, value in lexicon.items():
-        normalized_key = normalize_pashto_char(key)
-        normalized_value = value.copy()
-        if 'stems' in normalized_value:
-            normalized_value['stems'] = {k: normalize_pashto_char(v) for k, v in normalized_value['stems'].items()}
-        if 'inflected_forms' in normalized_value:
-            normalized_value['inflected_forms'] = [normalize_pashto_char(form) for form in normalized_value['inflected_forms']]
-        if 'related_roots' in normalized_value:
-            normalized_value['related_roots'] = [normalize_pashto_char(root) for root in normalized_value['related_roots']]
-        if 'base_root' in normalized_value:
-            normalized_value['base_root'] = normalize_pashto_char(normalized_value['base_root'])
-        normalized_lexicon[normalized_key] = normalized_value
-    return normalized_lexicon
+import sys
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+
+from grammar_core import build_trie, forms_to_dicts, load_normalized_word_data, normalize_lexicon, prefix_hits, write_json
 
 # --- Definitive Verb Lexicon (v14) ---
 VERB_LEXICON = normalize_lexicon({
@@ -42,22 +21,59 @@ IRREGULAR_NOUN_ADJ_LEXICON = normalize_lexicon({
     'مېلمه': {'type': 'Noun/Adj', 'pattern_info': 'Pattern 4 variant: Unusual masculine animate', 'inflected_forms': ['مېلمانه', 'مېلمنو', 'مېلمنې']}
 })
 
-def load_word_data(filepath='all_txt_copies/word_index_v10_final.txt'):
-    word_data = {}
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-            if match:
-                word, count, refs_str = match.groups()
-                normalized_word = normalize_pashto_char(word)
-                if normalized_word in word_data:
-                    word_data[normalized_word]['count'] += int(count)
-                    word_data[normalized_word]['verses'].extend(refs_str.split(', '))
-                else:
-                    word_data[normalized_word] = {'count': int(count), 'verses': list(set(refs_str.split(', ')))}
-    return word_data
-
-def find_all_possible_roots(word, all_words_set):
+# Every hit carries a (lexicon rank, position) key so results keep the order of
+# VERB_LEXICON: a root's stems in declaration order, then its related-root match.
+# Stems are keyed by their leading characters, so one walk finds every prefix.
+STEM_TRIE = build_trie(
+    (stem, ((rank, 0, pos), root, details, sys.intern(f"Derived from stem '{stem}'")))
+    for rank, (root, details) in enumerate(VERB_LEXICON.items())
+    for pos, stem in enumerate(details['stems'].values())
+)
+# Exact word -> hits: a related root points back at each verb that lists it
+VERB_WORD_HITS = {}
+for rank, (root, details) in enumerate(VERB_LEXICON.items()):
+    for related in dict.fromkeys(details.get('related_roots', ())):
+        VERB_WORD_HITS.setdefault(related, []).append(((rank, 1), root, details, sys.intern(f"Related form of '{root}'")))
+
+def match_verb_forms(word):
+    """Return (root, details, form_description) for the first verb analysis of word per root, in lexicon order."""
+    hits = prefix_hits(STEM_TRIE, word) + VERB_WORD_HITS.get(word, [])
+    hits.sort(key=itemgetter(0))
+    # Interpretations are deduplicated per (root, type), so later hits for a root are never used
+    first_per_root = {}
+    for hit in hits:
+        first_per_root.setdefault(hit[1], hit)
+    return [hit[1:] for hit in first_per_root.values()]
+
+# Root -> pattern_info for every lexicon root; a verb entry wins over a noun/adj one
+ROOT_PATTERN = {
+    root: details['pattern_info']
+    for root, details in chain(IRREGULAR_NOUN_ADJ_LEXICON.items(), VERB_LEXICON.items())
+}
+
+# Word -> [(root, details, is_base), ...] in lexicon order: each irregular root
+# is its own base form, and each inflected form points back at its root
+IRREGULAR_FORMS = {}
+for root, details in IRREGULAR_NOUN_ADJ_LEXICON.items():
+    IRREGULAR_FORMS.setdefault(root, []).append((root, details, True))
+    for form in dict.fromkeys(details['inflected_forms']):
+        if form != root:
+            IRREGULAR_FORMS.setdefault(form, []).append((root, details, False))
+
+# Shared analysis for words that no lexicon entry can match; read-only
+NOUN_ADJ_FALLBACK_DETAILS = {'type': 'Noun/Adj', 'pattern_info': 'N/A', 'form_description': 'Base Form'}
+
+def matches_lexicon(word):
+    """Return True if any verb, stem or irregular noun/adj entry can analyze word."""
+    return (word in VERB_LEXICON or word in VERB_WORD_HITS or word in IRREGULAR_FORMS
+            or bool(prefix_hits(STEM_TRIE, word)))
+
+@lru_cache(maxsize=None)
+def find_all_possible_roots(word):
+    """Return every (root, details_dict) interpretation of word as a tuple.
+
+    Memoized per word; reads the module-level all_words_set built in the main section.
+    """
     interpretations = []
     
     # 1. Verb Check (Direct, Stem, Compound, Related)
@@ -68,26 +84,25 @@ def find_all_possible_roots(word, all_words_set):
             interpretations.append((details['base_root'], interp))
         interpretations.append((word, interp))
 
-    for root, details in VERB_LEXICON.items():
-        for stem in details['stems'].values():
-            if word.startswith(stem):
-                interpretations.append((root, {'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': f"Derived from stem '{stem}'"}))
-        if 'related_roots' in details and word in details['related_roots']:
-            interpretations.append((root, {'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': f"Related form of '{root}'"}))
+    for root, details, form_description in match_verb_forms(word):
+        interpretations.append((root, {'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': form_description}))
 
     # 2. Noun/Adj Check (Irregular and Regular)
-    for root, details in IRREGULAR_NOUN_ADJ_LEXICON.items():
-        if word == root:
+    for root, details, is_base in IRREGULAR_FORMS.get(word, ()):
+        if is_base:
             interpretations.append((root, {'type': 'Noun/Adj', 'pattern_info': details['pattern_info'], 'form_description': 'Base Form'}))
-        elif word in details['inflected_forms']:
+        else:
             interpretations.append((root, {'type': 'Noun/Adj', 'pattern_info': details['pattern_info'], 'form_description': f"Inflected form of '{root}'"}))
     
     # Simple noun inflection patterns can be added here if needed, but we focus on explicit lexicon matches first.
 
     # 3. Fallback: Identify as a simple base form if no other pattern matches
     if word in all_words_set and not any(interp[0] == word for interp in interpretations):
-        interpretations.append((word, {'type': 'Noun/Adj', 'pattern_info': 'N/A', 'form_description': 'Base Form'}))
+        interpretations.append((word, NOUN_ADJ_FALLBACK_DETAILS))
     
+    # Most words have at most one interpretation, so there is nothing to dedupe
+    if len(interpretations) < 2:
+        return tuple(interpretations)
     unique_interpretations = []
     seen = set()
     for r, d in interpretations:
@@ -95,32 +110,42 @@ def find_all_possible_roots(word, all_words_set):
         if key not in seen:
             unique_interpretations.append((r, d))
             seen.add(key)
-    return unique_interpretations
+    return tuple(unique_interpretations)
 
 # --- Main Execution ---
-word_data = load_word_data()
+word_data = load_normalized_word_data()
 all_words_set = set(word_data.keys())
-final_index = defaultdict(lambda: {"identities": []})
+final_index = {}
+# (root, type) -> that identity dict inside final_index[root]["identities"]
+identity_by_key = {}
+# Most words match nothing in the lexicon and are simply their own base form
+fast_path_words = {word for word in all_words_set if not matches_lexicon(word)}
 
 for word, data in word_data.items():
-    interpretations = find_all_possible_roots(word, all_words_set)
+    # Pop the load-time set so it is freed as soon as its sorted list exists
+    verses = sorted(data.pop('verses'))
+    if word in fast_path_words:
+        interpretations = ((word, NOUN_ADJ_FALLBACK_DETAILS),)
+    else:
+        interpretations = find_all_possible_roots(word)
     if not interpretations:
         interpretations = [(word, {'type': 'Unknown', 'pattern_info': 'N/A', 'form_description': 'Base Form'})]
     
     for root, details in interpretations:
-        identity = next((id_obj for id_obj in final_index[root]['identities'] if id_obj['type'] == details['type']), None)
+        key = (root, details['type'])
+        identity = identity_by_key.get(key)
         
         if identity is None:
-            root_details_from_lexicon = VERB_LEXICON.get(root) or IRREGULAR_NOUN_ADJ_LEXICON.get(root)
-            pattern_info = root_details_from_lexicon['pattern_info'] if root_details_from_lexicon else details['pattern_info']
-            identity = {'type': details['type'], 'pattern_info': pattern_info, 'forms': defaultdict(list)}
-            final_index[root]['identities'].append(identity)
+            pattern_info = ROOT_PATTERN.get(root, details['pattern_info'])
+            identity = {'type': details['type'], 'pattern_info': pattern_info, 'forms': {}}
+            final_index.setdefault(root, {'identities': []})['identities'].append(identity)
+            identity_by_key[key] = identity
             
-        identity['forms'][details['form_description']].append({'form': word, 'count': data['count'], 'verses': data['verses']})
+        identity['forms'].setdefault(details['form_description'], []).append((word, data['count'], verses))
 
 output_path = 'all_txt_copies/grammatical_index_v14.json'
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(final_index, f, ensure_ascii=False, indent=2)
+forms_to_dicts(final_index)
+write_json(output_path, final_index)
 
 print(f"Definitive grammatical index (v14) created at: {output_path}")
 
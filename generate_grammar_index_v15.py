@@ -1,6 +1,12 @@
-import json
+import os
 import re
-from collections import defaultdict
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+
+from grammar_core import FORM_FIELDS, build_trie, forms_to_dicts, load_normalized_word_data, normalize_lexicon, prefix_hits, write_json
 
 # --- Transliteration Engine (based on LingDocs Phonetics) ---
 # NOTE: This is a simplified, rule-based transliterator. A full dictionary-based one would be more accurate.
@@ -16,46 +22,15 @@ TRANSLIT_MAP = {
 # Common vowel combinations
 TRANSLIT_MAP.update({'وا': 'waa', 'وي': 'wee', 'وو': 'oo'})
 
+# Two-character keys come first, so the regex prefers them like a longest-match scan
+TRANSLIT_RE = re.compile('|'.join(map(re.escape, sorted(TRANSLIT_MAP, key=len, reverse=True))))
+
+@lru_cache(maxsize=None)
 def transliterate(text):
-    """Simple rule-based transliteration of Pashto text."""
+    """Simple rule-based transliteration of Pashto text (memoized per string)."""
     # This is a very basic implementation. A real one needs complex context rules.
-    # For now, we'll just do character-by-character replacement.
-    res = ""
-    i = 0
-    while i < len(text):
-        # Check for two-character patterns first
-        if i + 1 < len(text) and text[i:i+2] in TRANSLIT_MAP:
-            res += TRANSLIT_MAP[text[i:i+2]]
-            i += 2
-        elif text[i] in TRANSLIT_MAP:
-            res += TRANSLIT_MAP[text[i]]
-            i += 1
-        else:
-            res += text[i] # Keep unknown characters
-            i += 1
-    return res
-
-# --- Unicode Normalization ---
-def normalize_pashto_char(text):
-    replacements = {'ي': 'ی', 'ى': 'ی', 'ئ': 'ی'}
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    return text
-
-def normalize_lexicon(lexicon):
-    normalized_lexicon = {}
-    for key, value in lexicon.items():
-        normalized_key = normalize_pashto_char(key)
-        normalized_value = value.copy()
-        for field in ['stems', 'inflected_forms', 'related_roots', 'base_root']:
-            if field in normalized_value and isinstance(normalized_value[field], dict):
-                normalized_value[field] = {k: normalize_pashto_char(v) for k, v in normalized_value[field].items()}
-            elif field in normalized_value and isinstance(normalized_value[field], list):
-                normalized_value[field] = [normalize_pashto_char(item) for item in normalized_value[field]]
-            elif field in normalized_value and isinstance(normalized_value[field], str):
-                 normalized_value[field] = normalize_pashto_char(normalized_value[field])
-        normalized_lexicon[normalized_key] = normalized_value
-    return normalized_lexicon
+    # For now, each mapped sequence is replaced and unknown characters are kept.
+    return TRANSLIT_RE.sub(lambda m: TRANSLIT_MAP[m.group()], text)
 
 # --- Definitive Lexicon (v15) ---
 VERB_LEXICON = normalize_lexicon({
@@ -70,47 +45,67 @@ IRREGULAR_NOUN_ADJ_LEXICON = normalize_lexicon({
     # Add other nouns...
 })
 
-# --- Word Data Loading (Normalized) ---
-def load_word_data(filepath='all_txt_copies/word_index_v10_final.txt'):
-    word_data = {}
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-            if match:
-                word, count, refs_str = match.groups()
-                normalized_word = normalize_pashto_char(word)
-                if normalized_word in word_data:
-                    word_data[normalized_word]['count'] += int(count)
-                    word_data[normalized_word]['verses'].extend(refs_str.split(', '))
-                else:
-                    word_data[normalized_word] = {'count': int(count), 'verses': list(set(refs_str.split(', ')))}
-    return word_data
+# Every hit carries a (lexicon rank, position) key so results keep the order of
+# VERB_LEXICON: a root's infinitive, its stems in declaration order, then its
+# related-root match. Stems are keyed by their leading characters, so one walk
+# finds every prefix.
+STEM_TRIE = build_trie(
+    (stem_form, ((rank, 1, pos), root, details, sys.intern(f"Conjugation from {stem_type} stem '{stem_form}'")))
+    for rank, (root, details) in enumerate(VERB_LEXICON.items())
+    for pos, (stem_type, stem_form) in enumerate(details['stems'].items())
+)
+# Exact word -> hits: each infinitive, and each related root pointing back at the verb that lists it
+VERB_WORD_HITS = {}
+for rank, (root, details) in enumerate(VERB_LEXICON.items()):
+    VERB_WORD_HITS.setdefault(root, []).append(((rank, 0), root, details, 'Infinitive Root'))
+    for related in dict.fromkeys(details.get('related_roots', ())):
+        VERB_WORD_HITS.setdefault(related, []).append(((rank, 2), root, details, sys.intern(f"Related Root: '{related}'")))
+
+def match_verb_forms(word):
+    """Return (root, details, form_description) for every verb analysis of word, in lexicon order."""
+    hits = prefix_hits(STEM_TRIE, word) + VERB_WORD_HITS.get(word, [])
+    hits.sort(key=itemgetter(0))
+    return [hit[1:] for hit in hits]
+
+# Root -> (pattern_info, translit) for every lexicon root; a verb entry wins over a noun/adj one
+ROOT_LABELS = {
+    root: (details.get('pattern_info', 'N/A'), details.get('translit', ''))
+    for root, details in chain(IRREGULAR_NOUN_ADJ_LEXICON.items(), VERB_LEXICON.items())
+}
+
+# Word -> [(root, details, is_base), ...] in lexicon order: each irregular root
+# is its own base form, and each inflected form points back at its root
+IRREGULAR_FORMS = {}
+for root, details in IRREGULAR_NOUN_ADJ_LEXICON.items():
+    IRREGULAR_FORMS.setdefault(root, []).append((root, details, True))
+    for form in dict.fromkeys(details['inflected_forms']):
+        if form != root:
+            IRREGULAR_FORMS.setdefault(form, []).append((root, details, False))
+
+# Regular plural endings whose stripped stem is linked back as the singular root
+PLURAL_ENDINGS = ('ان', 'انو')
+# Endings keyed by their reversed characters: one walk over the reversed word
+# finds every ending it has, shortest first
+PLURAL_ENDING_TRIE = build_trie((ending[::-1], ending) for ending in PLURAL_ENDINGS)
 
 # --- Definitive Grammar Engine (v15) ---
-def find_all_possible_roots(word, all_words_set):
+@lru_cache(maxsize=None)
+def find_all_possible_roots(word):
+    """Return every (root, details_dict) interpretation of word as a tuple.
+
+    Memoized per word; reads the module-level all_words_set built in the main section.
+    """
     interpretations = []
     
     # 1. Verb Analysis
-    for root, details in VERB_LEXICON.items():
-        # A. Direct infinitive match
-        if word == root:
-            interpretations.append((root, {'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': 'Infinitive Root'}))
-        # B. Stem-based derivation
-        for stem_type, stem_form in details['stems'].items():
-            if word.startswith(stem_form):
-                # This is where detailed conjugation labels would be generated.
-                # For now, we keep it simple.
-                desc = f"Conjugation from {stem_type} stem '{stem_form}'"
-                interpretations.append((root, {'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': desc}))
-        # C. Related root match
-        if 'related_roots' in details and word in details['related_roots']:
-            interpretations.append((root, {'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': f"Related Root: '{word}'"}))
+    for root, details, form_description in match_verb_forms(word):
+        interpretations.append((root, {'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': form_description}))
 
     # 2. Noun/Adj Analysis
-    for root, details in IRREGULAR_NOUN_ADJ_LEXICON.items():
-        if word == root:
+    for root, details, is_base in IRREGULAR_FORMS.get(word, ()):
+        if is_base:
             interpretations.append((root, {'type': 'Noun/Adj', 'pattern_info': details['pattern_info'], 'form_description': 'Base Form (Masc. Plain)'}))
-        elif word in details['inflected_forms']:
+        else:
              # This is where detailed inflection labels would be generated.
             desc = f"Inflection of '{root}'"
             interpretations.append((root, {'type': 'Noun/Adj', 'pattern_info': details['pattern_info'], 'form_description': desc}))
@@ -118,13 +113,11 @@ def find_all_possible_roots(word, all_words_set):
     # 3. Regular Noun/Adj Analysis (NEW)
     # Simple rule: if a word ends in a common plural, and its singular form exists, link them.
     # This is a basic approach and can be expanded.
-    plural_endings = ["ان", "انو"]
-    for ending in plural_endings:
-        if word.endswith(ending):
-            possible_root = word[:-len(ending)]
-            if possible_root in all_words_set:
-                 desc = f"Inflection of '{possible_root}'"
-                 interpretations.append((possible_root, {'type': 'Noun/Adj', 'pattern_info': 'Regular Noun/Adj', 'form_description': desc}))
+    for ending in prefix_hits(PLURAL_ENDING_TRIE, word[::-1]):
+        possible_root = word[:-len(ending)]
+        if possible_root in all_words_set:
+             desc = f"Inflection of '{possible_root}'"
+             interpretations.append((possible_root, {'type': 'Noun/Adj', 'pattern_info': 'Regular Noun/Adj', 'form_description': desc}))
 
 
     # 4. Fallback for un-lexiconed words
@@ -132,6 +125,9 @@ def find_all_possible_roots(word, all_words_set):
         interpretations.append((word, {'type': 'Unknown', 'pattern_info': 'N/A', 'form_description': 'Base Form'}))
 
     # Remove duplicates
+    # Most words have at most one interpretation, so there is nothing to dedupe
+    if len(interpretations) < 2:
+        return tuple(interpretations)
     unique_interpretations = []
     seen = set()
     for r, d in interpretations:
@@ -139,40 +135,65 @@ def find_all_possible_roots(word, all_words_set):
         if key not in seen:
             unique_interpretations.append((r, d))
             seen.add(key)
-    return unique_interpretations
+    return tuple(unique_interpretations)
 
 # --- Main Execution ---
-word_data = load_word_data()
-all_words_set = set(word_data.keys())
-final_index = defaultdict(lambda: {"identities": []})
-
-for word, data in word_data.items():
-    interpretations = find_all_possible_roots(word, all_words_set)
-    if not interpretations:
-        interpretations = [(word, {'type': 'Unknown', 'pattern_info': 'N/A', 'form_description': 'Base Form'})]
-    
-    for root, details in interpretations:
-        identity = next((id_obj for id_obj in final_index[root]['identities'] if id_obj['type'] == details['type']), None)
+# Below this many words, process start-up and pickling cost more than the
+# per-word analysis they would spread across cores
+PARALLEL_MIN_WORDS = 50000
+
+def init_worker(words):
+    global all_words_set
+    all_words_set = words
+
+def process_chunk(words):
+    """Return (word, interpretations, translit) for each word in one chunk."""
+    return [(word, find_all_possible_roots(word), transliterate(word)) for word in words]
+
+if __name__ == '__main__':
+    word_data = load_normalized_word_data()
+    all_words_set = set(word_data.keys())
+    words = list(word_data)
+    if len(words) < PARALLEL_MIN_WORDS:
+        analyses = process_chunk(words)
+    else:
+        workers = os.cpu_count() or 1
+        size = -(-len(words) // workers)
+        chunks = [words[i:i + size] for i in range(0, len(words), size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(all_words_set,)) as ex:
+            analyses = list(chain.from_iterable(ex.map(process_chunk, chunks)))
+
+    final_index = {}
+    # (root, type) -> that identity dict inside final_index[root]["identities"]
+    identity_by_key = {}
+
+    for word, interpretations, word_translit in analyses:
+        data = word_data[word]
+        # Pop the load-time set so it is freed as soon as its sorted list exists
+        verses = sorted(data.pop('verses'))
+        if not interpretations:
+            interpretations = [(word, {'type': 'Unknown', 'pattern_info': 'N/A', 'form_description': 'Base Form'})]
         
-        if identity is None:
-            lexicon_entry = VERB_LEXICON.get(root) or IRREGULAR_NOUN_ADJ_LEXICON.get(root)
-            identity = {
-                'type': details['type'],
-                'pattern_info': lexicon_entry.get('pattern_info', 'N/A') if lexicon_entry else 'Regular Noun/Adj',
-                'translit': lexicon_entry.get('translit', '') if lexicon_entry else transliterate(root),
-                'forms': defaultdict(list)
-            }
-            final_index[root]['identities'].append(identity)
+        for root, details in interpretations:
+            key = (root, details['type'])
+            identity = identity_by_key.get(key)
             
-        identity['forms'][details['form_description']].append({
-            'form': word,
-            'count': data['count'],
-            'verses': data['verses'],
-            'translit': transliterate(word) # Transliterate each form
-        })
-
-output_path = 'all_txt_copies/grammatical_index_v15.json'
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(final_index, f, ensure_ascii=False, indent=2)
-
-print(f"Definitive grammatical index (v15) with transliteration created at: {output_path}")
+            if identity is None:
+                labels = ROOT_LABELS.get(root)
+                pattern_info, translit = labels if labels else ('Regular Noun/Adj', transliterate(root))
+                identity = {
+                    'type': details['type'],
+                    'pattern_info': pattern_info,
+                    'translit': translit,
+                    'forms': {}
+                }
+                final_index.setdefault(root, {'identities': []})['identities'].append(identity)
+                identity_by_key[key] = identity
+                
+            identity['forms'].setdefault(details['form_description'], []).append((word, data['count'], verses, word_translit))
+
+    output_path = 'all_txt_copies/grammatical_index_v15.json'
+    forms_to_dicts(final_index, FORM_FIELDS + ('translit',))
+    write_json(output_path, final_index)
+
+    print(f"Definitive grammatical index (v15) with transliteration created at: {output_path}")
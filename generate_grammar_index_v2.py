@@ -1,24 +1,12 @@
 import json
-import re
-from collections import defaultdict
+
+from grammar_core import load_word_data, write_json
 
 # Based on https://grammar.lingdocs.com/inflection/inflection-patterns/
 # and https://grammar.lingdocs.com/verbs/
 # This script attempts to programmatically apply the described inflection and conjugation patterns
 # to group words under a common root.
 
-def load_word_data(filepath='all_txt_copies/word_index.txt'):
-    """Loads the flat word index into a dictionary."""
-    word_data = {}
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-            if match:
-                word, count, refs_str = match.groups()
-                refs = refs_str.split(', ')
-                word_data[word] = {'count': int(count), 'verses': refs}
-    return word_data
-
 def apply_patterns(all_words):
     """
     Applies inflection patterns to map each word to its potential root.
@@ -103,27 +91,26 @@ def get_word_details(word, root, all_words):
 
 
 # --- Main Execution ---
-word_data = load_word_data()
+word_data = load_word_data('all_txt_copies/word_index.txt')
 all_words_set = set(word_data.keys())
 root_map = apply_patterns(all_words_set)
 
-final_index = defaultdict(lambda: {
-    'type': 'Unknown', # Noun/Adj or Verb
-    'pattern_info': 'N/A',
-    'forms': defaultdict(list)
-})
+final_index = {}
 
 for word, data in word_data.items():
     root = root_map[word]
     word_type, form_description = get_word_details(word, root, all_words_set)
 
-    final_index[root]['type'] = word_type
+    entry = final_index.get(root)
+    if entry is None:
+        final_index[root] = entry = {'type': 'Unknown', 'pattern_info': 'N/A', 'forms': {}}
+    entry['type'] = word_type
     
     # Store the identified pattern with the root
     if "Pattern" in form_description:
-        final_index[root]['pattern_info'] = form_description.split(' - ')[0]
+        entry['pattern_info'] = form_description.split(' - ')[0]
 
-    final_index[root]['forms'][form_description].append({
+    entry['forms'].setdefault(form_description, []).append({
         'form': word,
         'count': data['count'],
         'verses': data['verses']
@@ -131,8 +118,7 @@ for word, data in word_data.items():
 
 # Save the new grammatical index to a JSON file
 output_path = 'all_txt_copies/grammatical_index_v2.py'
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(final_index, f, ensure_ascii=False, indent=2)
+write_json(output_path, final_index)
 
 print(f"New grammatical index created at: {output_path}")
 
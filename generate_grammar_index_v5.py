@@ -1,6 +1,6 @@
 import json
-import re
-from collections import defaultdict
+
+from grammar_core import load_word_data, write_json
 
 # --- Configuration ---
 COMPLEX_VERBS = {
@@ -15,17 +15,12 @@ COMPLEX_VERBS = {
     },
 }
 
-def load_word_data(filepath='all_txt_copies/word_index_v4_compound.txt'):
-    """Loads the flat word index into a dictionary."""
-    word_data = {}
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-            if match:
-                word, count, refs_str = match.groups()
-                refs = refs_str.split(', ')
-                word_data[word] = {'count': int(count), 'verses': refs}
-    return word_data
+# Flat (stem_type, stem, root, details) list, built once, in lexicon order
+VERB_STEMS = tuple(
+    (stem_type, stem, root, details)
+    for root, details in COMPLEX_VERBS.items()
+    for stem_type, stem in details['stems'].items()
+)
 
 def find_root_and_details_inclusive(word, all_words_set):
     """
@@ -33,29 +28,29 @@ def find_root_and_details_inclusive(word, all_words_set):
     It first assumes a word is its own root, then checks if it's part of a larger pattern.
     """
     # 1. Check for Complex Verb Conjugations
-    for root, details in COMPLEX_VERBS.items():
-        for stem_type, stem in details['stems'].items():
-            if word.startswith(stem):
-                return root, {
-                    'type': 'Verb',
-                    'pattern_info': details['pattern_info'],
-                    'form_description': f"Conjugation from {stem_type} stem '{stem}'"
-                }
+    for stem_type, stem, root, details in VERB_STEMS:
+        if word.startswith(stem):
+            return root, {
+                'type': 'Verb',
+                'pattern_info': details['pattern_info'],
+                'form_description': f"Conjugation from {stem_type} stem '{stem}'"
+            }
 
     # 2. Check for Noun/Adjective Inflections
-    if word.endswith(('ي', 'یو', 'یه')):
-        potential_root_stem = re.sub(r'(ي|یو|یه)$', '', word)
-        potential_root = potential_root_stem + 'ی'
-        if potential_root in all_words_set:
-            inf_type = "Unknown Inflection"
-            if word.endswith('ي'): inf_type = "1st Inflection (Masc)"
-            if word.endswith('یو'): inf_type = "2nd Inflection (Masc)"
-            if word.endswith('یه'): inf_type = "Vocative (Masc)"
-            return potential_root, {
-                'type': 'Noun/Adj',
-                'pattern_info': 'Pattern 2: Unstressed ی',
-                'form_description': inf_type
-            }
+    if word.endswith('ي'):
+        potential_root, inf_type = word[:-1] + 'ی', "1st Inflection (Masc)"
+    elif word.endswith('یو'):
+        potential_root, inf_type = word[:-2] + 'ی', "2nd Inflection (Masc)"
+    elif word.endswith('یه'):
+        potential_root, inf_type = word[:-2] + 'ی', "Vocative (Masc)"
+    else:
+        potential_root = None
+    if potential_root is not None and potential_root in all_words_set:
+        return potential_root, {
+            'type': 'Noun/Adj',
+            'pattern_info': 'Pattern 2: Unstressed ی',
+            'form_description': inf_type
+        }
             
     # 3. Default Case: The word is its own root. This ensures nothing is ever dropped.
     return word, {
@@ -65,26 +60,31 @@ def find_root_and_details_inclusive(word, all_words_set):
     }
 
 # --- Main Execution ---
-word_data = load_word_data()
+word_data = load_word_data('all_txt_copies/word_index_v4_compound.txt')
 all_words_set = set(word_data.keys())
 
 # A much simpler, more direct approach to building the index
-final_index = defaultdict(lambda: {
-    'type': 'Unknown',
-    'pattern_info': 'N/A',
-    'forms': defaultdict(list)
-})
+final_index = {}
+
+# Root -> the root's own analysis; most words share a few hundred roots
+root_details_cache = {}
 
 for word, data in word_data.items():
     root, details = find_root_and_details_inclusive(word, all_words_set)
     
     # Use the root's details for the main entry
-    _, root_details = find_root_and_details_inclusive(root, all_words_set)
-    final_index[root]['type'] = root_details['type']
-    final_index[root]['pattern_info'] = root_details['pattern_info']
+    root_details = root_details_cache.get(root)
+    if root_details is None:
+        _, root_details = find_root_and_details_inclusive(root, all_words_set)
+        root_details_cache[root] = root_details
+    entry = final_index.get(root)
+    if entry is None:
+        final_index[root] = entry = {'type': 'Unknown', 'pattern_info': 'N/A', 'forms': {}}
+    entry['type'] = root_details['type']
+    entry['pattern_info'] = root_details['pattern_info']
     
     # Add the current word's form data under its specific description
-    final_index[root]['forms'][details['form_description']].append({
+    entry['forms'].setdefault(details['form_description'], []).append({
         'form': word,
         'count': data['count'],
         'verses': data['verses']
@@ -93,8 +93,7 @@ for word, data in word_data.items():
 
 # Save the new, high-fidelity index
 output_path = 'all_txt_copies/grammatical_index_v5.json'
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(final_index, f, ensure_ascii=False, indent=2)
+write_json(output_path, final_index)
 
 print(f"New, inclusive grammatical index created at: {output_path}")
 
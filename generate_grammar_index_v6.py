@@ -1,6 +1,4 @@
-import json
-import re
-from collections import defaultdict
+from grammar_core import load_word_data, write_json
 
 # --- Configuration ---
 COMPLEX_VERBS = {
@@ -11,53 +9,61 @@ COMPLEX_VERBS = {
     },
 }
 
-def load_word_data(filepath='all_txt_copies/word_index_v4_compound.txt'):
-    word_data = {}
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-            if match:
-                word, count, refs_str = match.groups()
-                refs = refs_str.split(', ')
-                word_data[word] = {'count': int(count), 'verses': refs}
-    return word_data
+# Flat (stem_type, stem, root, details) list, built once, in lexicon order
+VERB_STEMS = tuple(
+    (stem_type, stem, root, details)
+    for root, details in COMPLEX_VERBS.items()
+    for stem_type, stem in details['stems'].items()
+)
 
 def find_root_and_details_inclusive(word, all_words_set):
     # 1. Complex Verbs
-    for root, details in COMPLEX_VERBS.items():
-        for stem_type, stem in details['stems'].items():
-            if word.startswith(stem):
-                return root, { 'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': f"Conjugation from {stem_type} stem '{stem}'" }
+    for stem_type, stem, root, details in VERB_STEMS:
+        if word.startswith(stem):
+            return root, { 'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': f"Conjugation from {stem_type} stem '{stem}'" }
     # 2. Noun Inflections
-    if word.endswith(('ي', 'یو', 'یه')):
-        potential_root = re.sub(r'(ي|یو|یه)$', '', word) + 'ی'
-        if potential_root in all_words_set:
-            inf_type = "1st Inflection (Masc)" if word.endswith('ي') else "2nd Inflection (Masc)" if word.endswith('یو') else "Vocative (Masc)"
-            return potential_root, { 'type': 'Noun/Adj', 'pattern_info': 'Pattern 2: Unstressed ی', 'form_description': inf_type }
+    if word.endswith('ي'):
+        potential_root, inf_type = word[:-1] + 'ی', "1st Inflection (Masc)"
+    elif word.endswith('یو'):
+        potential_root, inf_type = word[:-2] + 'ی', "2nd Inflection (Masc)"
+    elif word.endswith('یه'):
+        potential_root, inf_type = word[:-2] + 'ی', "Vocative (Masc)"
+    else:
+        potential_root = None
+    if potential_root is not None and potential_root in all_words_set:
+        return potential_root, { 'type': 'Noun/Adj', 'pattern_info': 'Pattern 2: Unstressed ی', 'form_description': inf_type }
     # 3. Default
     return word, { 'type': 'Noun/Adj', 'pattern_info': 'N/A', 'form_description': 'Base Form' }
 
 # --- RADICALLY SIMPLIFIED MAIN EXECUTION ---
-word_data = load_word_data()
+word_data = load_word_data('all_txt_copies/word_index_v4_compound.txt')
 all_words_set = set(word_data.keys())
-final_index = defaultdict(lambda: {'type': 'Unknown', 'pattern_info': 'N/A', 'forms': defaultdict(list)})
+final_index = {}
+
+# Root -> the root's own analysis; most words share a few hundred roots
+root_details_cache = {}
 
 for word, data in word_data.items():
     root, details = find_root_and_details_inclusive(word, all_words_set)
-    final_index[root]['forms'][details['form_description']].append({
+    entry = final_index.get(root)
+    if entry is None:
+        final_index[root] = entry = {'type': 'Unknown', 'pattern_info': 'N/A', 'forms': {}}
+    entry['forms'].setdefault(details['form_description'], []).append({
         'form': word,
         'count': data['count'],
         'verses': data['verses']
     })
     # Assign type and pattern based on the root's own details
-    root_for_type, type_details = find_root_and_details_inclusive(root, all_words_set)
-    final_index[root]['type'] = type_details['type']
-    final_index[root]['pattern_info'] = type_details['pattern_info']
+    type_details = root_details_cache.get(root)
+    if type_details is None:
+        _, type_details = find_root_and_details_inclusive(root, all_words_set)
+        root_details_cache[root] = type_details
+    entry['type'] = type_details['type']
+    entry['pattern_info'] = type_details['pattern_info']
 
 
 output_path = 'all_txt_copies/grammatical_index_v6.json'
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(final_index, f, ensure_ascii=False, indent=2)
+write_json(output_path, final_index)
 
 print(f"New index created at: {output_path}")
 
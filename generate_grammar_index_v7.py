@@ -1,6 +1,7 @@
 import json
-import re
-from collections import defaultdict
+from operator import itemgetter
+
+from grammar_core import build_trie, load_word_data, prefix_hits, write_json
 
 # --- Configuration ---
 COMPLEX_VERBS = {
@@ -8,17 +9,17 @@ COMPLEX_VERBS = {
     'خېژول': { 'type': 'Verb', 'stems': { 'present': 'خېژو', 'past': 'خېژول' }, 'pattern_info': 'Regular Verb'}
 }
 VERB_PREFIXES = ['و', 'م', 'مه'] # e.g., وخېژول, مه کوئ
+# Tried longest first, so 'مه' is stripped before 'م' gets a chance
+PREFIXES_LONGEST_FIRST = tuple(sorted(VERB_PREFIXES, key=len, reverse=True))
 
-def load_word_data(filepath='all_txt_copies/word_index_v4_compound.txt'):
-    word_data = {}
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-            if match:
-                word, count, refs_str = match.groups()
-                refs = refs_str.split(', ')
-                word_data[word] = {'count': int(count), 'verses': refs}
-    return word_data
+# Each verb's stems keyed by their leading characters, plus its root as an
+# exact match; payloads carry the lexicon rank so the earliest verb wins
+STEM_TRIE = build_trie(
+    (stem, (rank, root, details))
+    for rank, (root, details) in enumerate(COMPLEX_VERBS.items())
+    for stem in details['stems'].values()
+)
+VERB_ROOTS = {root: (rank, root, details) for rank, (root, details) in enumerate(COMPLEX_VERBS.items())}
 
 def find_root_and_details_prefix_aware(word, all_words_set):
     """
@@ -28,7 +29,7 @@ def find_root_and_details_prefix_aware(word, all_words_set):
     prefix_found = ""
 
     # 1. Tentatively strip a known prefix
-    for p in VERB_PREFIXES:
+    for p in PREFIXES_LONGEST_FIRST:
         if word.startswith(p):
             potential_stem = word[len(p):]
             # To be valid, the remaining stem must also exist as a word or be a known root
@@ -38,43 +39,59 @@ def find_root_and_details_prefix_aware(word, all_words_set):
                 break
 
     # 2. Check for Complex Verb Conjugations (on the potentially stripped stem)
-    for root, details in COMPLEX_VERBS.items():
-        if word == root or any(word.startswith(s) for s in details['stems'].values()):
-             return root, { 'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': f"Conjugation (prefix: {prefix_found or 'none'})" }
+    hits = prefix_hits(STEM_TRIE, word)
+    if word in VERB_ROOTS:
+        hits.append(VERB_ROOTS[word])
+    if hits:
+        _, root, details = min(hits, key=itemgetter(0))
+        return root, { 'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': f"Conjugation (prefix: {prefix_found or 'none'})" }
 
     # 3. Check for Noun/Adjective Inflections (this should not happen to verbs)
     if not prefix_found:
-        if word.endswith(('ي', 'یو', 'یه')):
-            potential_root = re.sub(r'(ي|یو|یه)$', '', word) + 'ی'
-            if potential_root in all_words_set:
-                inf_type = "1st Inflection (Masc)" if word.endswith('ي') else "2nd Inflection (Masc)" if word.endswith('یو') else "Vocative (Masc)"
-                return potential_root, { 'type': 'Noun/Adj', 'pattern_info': 'Pattern 2: Unstressed ی', 'form_description': inf_type }
+        if word.endswith('ي'):
+            potential_root, inf_type = word[:-1] + 'ی', "1st Inflection (Masc)"
+        elif word.endswith('یو'):
+            potential_root, inf_type = word[:-2] + 'ی', "2nd Inflection (Masc)"
+        elif word.endswith('یه'):
+            potential_root, inf_type = word[:-2] + 'ی', "Vocative (Masc)"
+        else:
+            potential_root = None
+        if potential_root is not None and potential_root in all_words_set:
+            return potential_root, { 'type': 'Noun/Adj', 'pattern_info': 'Pattern 2: Unstressed ی', 'form_description': inf_type }
 
     # 4. Default Case: The original word is its own root
     return original_word, { 'type': 'Noun/Adj', 'pattern_info': 'N/A', 'form_description': 'Base Form' }
 
 # --- Main Execution ---
-word_data = load_word_data()
+word_data = load_word_data('all_txt_copies/word_index_v4_compound.txt')
 all_words_set = set(word_data.keys())
-final_index = defaultdict(lambda: {'type': 'Unknown', 'pattern_info': 'N/A', 'forms': defaultdict(list)})
+final_index = {}
+
+# Root -> the root's own analysis; most words share a few hundred roots
+root_details_cache = {}
 
 for word, data in word_data.items():
     root, details = find_root_and_details_prefix_aware(word, all_words_set)
     
     # Assign type and pattern based on the root's own details
-    _, root_details = find_root_and_details_prefix_aware(root, all_words_set)
-    final_index[root]['type'] = root_details['type']
-    final_index[root]['pattern_info'] = root_details['pattern_info']
+    root_details = root_details_cache.get(root)
+    if root_details is None:
+        _, root_details = find_root_and_details_prefix_aware(root, all_words_set)
+        root_details_cache[root] = root_details
+    entry = final_index.get(root)
+    if entry is None:
+        final_index[root] = entry = {'type': 'Unknown', 'pattern_info': 'N/A', 'forms': {}}
+    entry['type'] = root_details['type']
+    entry['pattern_info'] = root_details['pattern_info']
     
-    final_index[root]['forms'][details['form_description']].append({
+    entry['forms'].setdefault(details['form_description'], []).append({
         'form': word,
         'count': data['count'],
         'verses': data['verses']
     })
 
 output_path = 'all_txt_copies/grammatical_index_v7.json'
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(final_index, f, ensure_ascii=False, indent=2)
+write_json(output_path, final_index)
 
 print(f"New, prefix-aware grammatical index created at: {output_path}")
 
@@ -1,6 +1,9 @@
 import json
-import re
+import sys
 from collections import defaultdict
+from operator import itemgetter
+
+from grammar_core import build_trie, load_word_data, prefix_hits, write_json
 
 # --- Definitive Grammar Configuration ---
 # This lexicon is the core of the new engine. It is built to model Pashto verb grammar correctly.
@@ -31,15 +34,23 @@ VERB_LEXICON = {
     # Add more verbs with their stems here
 }
 
-def load_word_data(filepath='all_txt_copies/word_index_v4_compound.txt'):
-    word_data = {}
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-            if match:
-                word, count, refs_str = match.groups()
-                word_data[word] = {'count': int(count), 'verses': refs_str.split(', ')}
-    return word_data
+# Verb stems keyed by their leading characters, so one walk finds every stem
+# the word starts with. The earliest root in VERB_LEXICON wins, then its
+# longest stem (so e.g. 'وخ' cannot match before 'وخېژو').
+STEM_TRIE = build_trie(
+    (stem, ((rank, -len(stem), pos), stem_type, stem, root, details))
+    for rank, (root, details) in enumerate(VERB_LEXICON.items())
+    for pos, (stem_type, stem) in enumerate(details['stems'].items())
+)
+
+# Only words that are a lexicon root, start like some stem, or carry an
+# inflection ending can leave the default branch; the main loop skips the
+# engine for the rest, which is most of the corpus
+INFLECTION_ENDINGS = ('ي', 'یو', 'یه')
+BASE_FORM_DETAILS = { 'type': 'Noun/Adj', 'pattern_info': 'N/A', 'form_description': 'Base Form' }
+
+def may_be_derived(word):
+    return word in VERB_LEXICON or word[:1] in STEM_TRIE or word.endswith(INFLECTION_ENDINGS)
 
 def find_root_and_details_stem_aware(word, all_words_set):
     """The definitive, stem-aware grammar engine."""
@@ -49,34 +60,44 @@ def find_root_and_details_stem_aware(word, all_words_set):
          return word, { 'type': 'Verb', 'pattern_info': VERB_LEXICON[word]['pattern_info'], 'form_description': 'Infinitive Root' }
 
     # 2. Check if the word is derived from a known verb stem
-    for root, details in VERB_LEXICON.items():
-        # Sort stems by length (longest first) to avoid partial matches (e.g., 'وخ' matching before 'وخېژو')
-        sorted_stems = sorted(details['stems'].items(), key=lambda x: len(x[1]), reverse=True)
-        for stem_type, stem in sorted_stems:
-            if word.startswith(stem):
-                return root, { 'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': f"Derived from {stem_type.replace('_', ' ')} '{stem}'" }
+    hits = prefix_hits(STEM_TRIE, word)
+    if hits:
+        _, stem_type, stem, root, details = min(hits, key=itemgetter(0))
+        # One shared description string per stem rather than one per word
+        return root, { 'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': sys.intern(f"Derived from {stem_type.replace('_', ' ')} '{stem}'") }
 
     # 3. Check for Noun/Adjective Inflections (fallback)
-    if word.endswith(('ي', 'یو', 'یه')):
-        potential_root = re.sub(r'(ي|یو|یه)$', '', word) + 'ی'
-        if potential_root in all_words_set:
-            inf_type = "1st Inflection (Masc)" if word.endswith('ي') else "2nd Inflection (Masc)" if word.endswith('یو') else "Vocative (Masc)"
-            return potential_root, { 'type': 'Noun/Adj', 'pattern_info': 'Pattern 2: Unstressed ی', 'form_description': inf_type }
+    if word.endswith('ي'):
+        potential_root, inf_type = word[:-1] + 'ی', "1st Inflection (Masc)"
+    elif word.endswith('یو'):
+        potential_root, inf_type = word[:-2] + 'ی', "2nd Inflection (Masc)"
+    elif word.endswith('یه'):
+        potential_root, inf_type = word[:-2] + 'ی', "Vocative (Masc)"
+    else:
+        potential_root = None
+    if potential_root is not None and potential_root in all_words_set:
+        return potential_root, { 'type': 'Noun/Adj', 'pattern_info': 'Pattern 2: Unstressed ی', 'form_description': inf_type }
             
     # 4. Default Case: The word is its own root
     return word, { 'type': 'Noun/Adj', 'pattern_info': 'N/A', 'form_description': 'Base Form' }
 
+# Shared stand-in for roots missing from VERB_LEXICON, rather than a fresh {} per word
+NON_VERB_ROOT_DETAILS = {'type': 'Noun/Adj', 'pattern_info': 'N/A'}
+
 # --- Main Execution ---
-word_data = load_word_data()
+word_data = load_word_data('all_txt_copies/word_index_v4_compound.txt')
 all_words_set = set(word_data.keys())
 final_index = defaultdict(lambda: {'type': 'Unknown', 'pattern_info': 'N/A', 'forms': defaultdict(list)})
 
 for word, data in word_data.items():
-    root, details = find_root_and_details_stem_aware(word, all_words_set)
+    if may_be_derived(word):
+        root, details = find_root_and_details_stem_aware(word, all_words_set)
+    else:
+        root, details = word, BASE_FORM_DETAILS
     
-    root_details = VERB_LEXICON.get(root, {}) # Get details if the root is a known verb
-    final_index[root]['type'] = root_details.get('type', 'Noun/Adj')
-    final_index[root]['pattern_info'] = root_details.get('pattern_info', 'N/A')
+    root_details = VERB_LEXICON.get(root, NON_VERB_ROOT_DETAILS) # Get details if the root is a known verb
+    final_index[root]['type'] = root_details['type']
+    final_index[root]['pattern_info'] = root_details['pattern_info']
     
     final_index[root]['forms'][details['form_description']].append({
         'form': word,
@@ -85,8 +106,7 @@ for word, data in word_data.items():
     })
 
 output_path = 'all_txt_copies/grammatical_index_v8.json'
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(final_index, f, ensure_ascii=False, indent=2)
+write_json(output_path, final_index)
 
 print(f"Definitive, stem-aware grammatical index created at: {output_path}")
 
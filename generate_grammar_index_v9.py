@@ -1,6 +1,8 @@
-import json
-import re
+import sys
 from collections import defaultdict
+from operator import itemgetter
+
+from grammar_core import build_trie, load_word_data, prefix_hits, write_json
 
 # --- Definitive Grammar Configuration ---
 VERB_LEXICON = {
@@ -28,15 +30,23 @@ VERB_LEXICON = {
     },
 }
 
-def load_word_data(filepath='all_txt_copies/word_index_v4_compound.txt'):
-    word_data = {}
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-            if match:
-                word, count, refs_str = match.groups()
-                word_data[word] = {'count': int(count), 'verses': refs_str.split(', ')}
-    return word_data
+# Verb stems keyed by their leading characters, so one walk finds every stem
+# the word starts with. The earliest root in VERB_LEXICON wins, then its
+# longest stem (so e.g. 'وخ' cannot match before 'وخېژو').
+STEM_TRIE = build_trie(
+    (stem, ((rank, -len(stem), pos), stem_type, stem, root, details))
+    for rank, (root, details) in enumerate(VERB_LEXICON.items())
+    for pos, (stem_type, stem) in enumerate(details['stems'].items())
+)
+
+# Only words that are a lexicon root, start like some stem, or carry an
+# inflection ending can leave the default branch; the main loop skips the
+# engine for the rest, which is most of the corpus
+INFLECTION_ENDINGS = ('ي', 'یو', 'یه')
+BASE_FORM_DETAILS = { 'type': 'Noun/Adj', 'pattern_info': 'N/A', 'form_description': 'Base Form' }
+
+def may_be_derived(word):
+    return word in VERB_LEXICON or word[:1] in STEM_TRIE or word.endswith(INFLECTION_ENDINGS)
 
 def find_root_and_details_stem_aware(word, all_words_set):
     """The definitive, stem-aware grammar engine."""
@@ -46,30 +56,41 @@ def find_root_and_details_stem_aware(word, all_words_set):
          return word, { 'type': 'Verb', 'pattern_info': VERB_LEXICON[word]['pattern_info'], 'form_description': 'Infinitive Root' }
 
     # 2. Check if the word is derived from a known verb stem
-    for root, details in VERB_LEXICON.items():
-        sorted_stems = sorted(details['stems'].items(), key=lambda x: len(x[1]), reverse=True)
-        for stem_type, stem in sorted_stems:
-            if word.startswith(stem):
-                return root, { 'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': f"Derived from {stem_type.replace('_', ' ')} '{stem}'" }
+    hits = prefix_hits(STEM_TRIE, word)
+    if hits:
+        _, stem_type, stem, root, details = min(hits, key=itemgetter(0))
+        # One shared description string per stem rather than one per word
+        return root, { 'type': 'Verb', 'pattern_info': details['pattern_info'], 'form_description': sys.intern(f"Derived from {stem_type.replace('_', ' ')} '{stem}'") }
 
     # 3. Check for Noun/Adjective Inflections
-    if word.endswith(('ي', 'یو', 'یه')):
-        potential_root = re.sub(r'(ي|یو|یه)$', '', word) + 'ی'
-        if potential_root in all_words_set:
-            inf_type = "1st Inflection (Masc)" if word.endswith('ي') else "2nd Inflection (Masc)" if word.endswith('یو') else "Vocative (Masc)"
-            return potential_root, { 'type': 'Noun/Adj', 'pattern_info': 'Pattern 2: Unstressed ی', 'form_description': inf_type }
+    if word.endswith('ي'):
+        potential_root, inf_type = word[:-1] + 'ی', "1st Inflection (Masc)"
+    elif word.endswith('یو'):
+        potential_root, inf_type = word[:-2] + 'ی', "2nd Inflection (Masc)"
+    elif word.endswith('یه'):
+        potential_root, inf_type = word[:-2] + 'ی', "Vocative (Masc)"
+    else:
+        potential_root = None
+    if potential_root is not None and potential_root in all_words_set:
+        return potential_root, { 'type': 'Noun/Adj', 'pattern_info': 'Pattern 2: Unstressed ی', 'form_description': inf_type }
             
     # 4. Default Case
     return word, { 'type': 'Noun/Adj', 'pattern_info': 'N/A', 'form_description': 'Base Form' }
 
 # --- Main Execution (Corrected Logic) ---
-word_data = load_word_data()
+word_data = load_word_data('all_txt_copies/word_index_v4_compound.txt')
 all_words_set = set(word_data.keys())
 final_index = defaultdict(lambda: {'forms': defaultdict(list)})
 
+# Root -> the root's own analysis; most words share a few hundred roots
+root_details_cache = {}
+
 # This logic ensures the root's type is always set correctly from the lexicon.
 for word, data in word_data.items():
-    root, details = find_root_and_details_stem_aware(word, all_words_set)
+    if may_be_derived(word):
+        root, details = find_root_and_details_stem_aware(word, all_words_set)
+    else:
+        root, details = word, BASE_FORM_DETAILS
     
     # ** THE FIX IS HERE **
     # Always get the root's definitive details from the lexicon if it exists.
@@ -77,8 +98,12 @@ for word, data in word_data.items():
         final_index[root]['type'] = VERB_LEXICON[root]['type']
         final_index[root]['pattern_info'] = VERB_LEXICON[root]['pattern_info']
     else:
-        # Fallback for non-verbs
-        _, root_details = find_root_and_details_stem_aware(root, all_words_set)
+        # Fallback for non-verbs; a word that is its own root was just
+        # analysed, so only derived forms need the root looked up
+        root_details = details if root == word else root_details_cache.get(root)
+        if root_details is None:
+            _, root_details = find_root_and_details_stem_aware(root, all_words_set)
+            root_details_cache[root] = root_details
         final_index[root]['type'] = root_details['type']
         final_index[root]['pattern_info'] = root_details['pattern_info']
     
@@ -89,8 +114,7 @@ for word, data in word_data.items():
     })
 
 output_path = 'all_txt_copies/grammatical_index_v9.json'
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(final_index, f, ensure_ascii=False, indent=2)
+write_json(output_path, final_index)
 
 print(f"Definitive, corrected grammatical index created at: {output_path}")
 
@@ -1,6 +1,6 @@
-import json
 import re
-from collections import defaultdict
+
+from grammar_core import load_word_data, write_json
 
 # Expanded Pashto POS rules (based on https://grammar.lingdocs.com)
 # This is a heuristic approach and may not be perfect for all cases.
@@ -14,6 +14,16 @@ known_preps_posts = ['د', 'په', 'له', 'ته', 'کې', 'سره', 'لپاره
 known_adverbs = ['نو', 'بیا', 'هم', 'چېرته', 'کله', 'څنګه', 'ولې', 'ډېر', 'لږ']
 known_conjunctions = ['او', 'خو', 'که']
 
+def suffix_pattern(suffixes, min_root):
+    """Compile a (root)(suffix) matcher that finds the longest suffix leaving at least min_root chars."""
+    # The lazy root group tries the shortest root first, i.e. the longest suffix
+    alternation = '|'.join(map(re.escape, sorted(suffixes, key=len, reverse=True)))
+    return re.compile(f'(.{{{min_root},}}?)({alternation})', re.S)
+
+VERB_SUFFIX_RE = suffix_pattern(verb_suffixes, 2)
+NOUN_SUFFIX_RE = suffix_pattern(noun_suffixes, 1) # Noun roots can be short
+ADJ_SUFFIX_RE = suffix_pattern(adj_suffixes, 2)
+
 def infer_root_and_pos(word):
     if word in known_pronouns: return word, 'pronoun', ''
     if word in known_preps_posts: return word, 'preposition/postposition', ''
@@ -21,52 +31,43 @@ def infer_root_and_pos(word):
     if word in known_conjunctions: return word, 'conjunction', ''
 
     # Check for verb suffixes first as they are more distinctive
-    for suf in sorted(verb_suffixes, key=len, reverse=True):
-        if word.endswith(suf):
-            root = word[:-len(suf)]
-            if len(root) >= 2:
-                return root, 'verb', suf
+    match = VERB_SUFFIX_RE.fullmatch(word)
+    if match:
+        return match[1], 'verb', match[2]
 
     # Check for noun suffixes
-    for suf in sorted(noun_suffixes, key=len, reverse=True):
-        if word.endswith(suf):
-            root = word[:-len(suf)]
-            if len(root) >= 1: # Noun roots can be short
-                return root, 'noun', suf
-    
+    match = NOUN_SUFFIX_RE.fullmatch(word)
+    if match:
+        return match[1], 'noun', match[2]
+
     # Check for adjective suffixes
-    for suf in sorted(adj_suffixes, key=len, reverse=True):
-        if word.endswith(suf):
-            root = word[:-len(suf)]
-            if len(root) >= 2:
-                return root, 'adjective', suf
+    match = ADJ_SUFFIX_RE.fullmatch(word)
+    if match:
+        return match[1], 'adjective', match[2]
 
     return word, 'other', ''
 
 # 1. Load the original flat word index
-word_index = {}
-with open('all_txt_copies/word_index.txt', 'r', encoding='utf-8') as f:
-    for line in f:
-        if line.strip():
-            match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-            if match:
-                word, count, refs_str = match.groups()
-                refs = refs_str.split(', ')
-                word_index[word] = {'count': int(count), 'verses': refs}
+word_index = load_word_data('all_txt_copies/word_index.txt')
 
 # 2. Process and group the words
-structured_index = defaultdict(lambda: defaultdict(list))
+# Grouped flat by (root, pos), then nested once for output; insertion order
+# keeps roots and each root's POS in first-seen order
+grouped = {}
 for word, data in word_index.items():
     root, pos, suffix = infer_root_and_pos(word)
-    structured_index[root][pos].append({
+    grouped.setdefault((root, pos), []).append({
         'form': word,
         'suffix': suffix,
         'count': data['count'],
         'verses': data['verses']
     })
 
+structured_index = {}
+for (root, pos), forms in grouped.items():
+    structured_index.setdefault(root, {})[pos] = forms
+
 # 3. Save the structured index to a JSON file
-with open('all_txt_copies/structured_index.json', 'w', encoding='utf-8') as f:
-    json.dump(structured_index, f, ensure_ascii=False, indent=2)
+write_json('all_txt_copies/structured_index.json', structured_index)
 
 print("Structured index created at all_txt_copies/structured_index.json")
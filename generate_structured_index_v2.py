@@ -1,6 +1,6 @@
 import json
-import re
-from collections import defaultdict
+
+from grammar_core import load_word_data, write_json
 
 # --- Pashto Inflection Patterns ---
 # Based on user feedback and grammar rules (e.g., LingDocs Inflection Pattern #2)
@@ -64,15 +64,7 @@ def infer_pos(word, root, known_lists):
 # --- Main Script ---
 
 # 1. Load the original flat word index to get all words and their data
-word_index = {}
-with open('all_txt_copies/word_index.txt', 'r', encoding='utf-8') as f:
-    for line in f:
-        if line.strip():
-            match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-            if match:
-                word, count, refs_str = match.groups()
-                refs = refs_str.split(', ')
-                word_index[word] = {'count': int(count), 'verses': refs}
+word_index = load_word_data('all_txt_copies/word_index.txt')
 
 all_words_set = set(word_index.keys())
 
@@ -88,21 +80,26 @@ known_lists = {
 }
 
 # 4. Group words by their identified root and inferred POS
-structured_index = defaultdict(lambda: defaultdict(list))
+# Grouped flat by (root, pos), then nested once for output; insertion order
+# keeps roots and each root's POS in first-seen order
+grouped = {}
 for word, data in word_index.items():
     root = root_map.get(word, word)
     pos = infer_pos(word, root, known_lists)
     
-    structured_index[root][pos].append({
+    grouped.setdefault((root, pos), []).append({
         'form': word,
         'count': data['count'],
         'verses': data['verses']
     })
 
+structured_index = {}
+for (root, pos), forms in grouped.items():
+    structured_index.setdefault(root, {})[pos] = forms
+
 # 5. Save the new, more accurate structured index to JSON
 output_path = 'all_txt_copies/structured_index_v2.json'
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(structured_index, f, ensure_ascii=False, indent=2)
+write_json(output_path, structured_index)
 
 print(f"New structured index created at {output_path}")
 print(f"Example grouping for 'هډوکی':")
@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
-"""Generate word_frequency_list.json from grammatical_index_v15.json using only stdlib.
+"""Generate word_frequency_list.json from grammatical_index_v15.json.
+
+Only the stdlib is required; orjson is used for parsing and writing when
+installed. Pass --ndjson to also write word_frequency_list.ndjson, one
+record per line, for readers that stream instead of loading the whole list.
 
 Output schema (list of dicts):
   - pashto: str
@@ -9,27 +13,41 @@ Output schema (list of dicts):
 """
 import json
 import os
+import sys
+from collections import Counter
 from typing import Dict, Any, List
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
+
 
 APP_ROOT = os.path.dirname(os.path.abspath(__file__))
 INDEX_FILE = os.path.join(APP_ROOT, 'all_txt_copies', 'grammatical_index_v15.json')
 DICT_FILE = os.path.join(APP_ROOT, 'full_dictionary.json')
 OUT_FILE = os.path.join(APP_ROOT, 'word_frequency_list.json')
+NDJSON_OUT_FILE = os.path.join(APP_ROOT, 'word_frequency_list.ndjson')
 
 
-def load_index() -> Dict[str, Any]:
-    with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+def load_json(path: str) -> Any:
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
+def load_index() -> Dict[str, Any]:
+    return load_json(INDEX_FILE)
+
+
 def build_dict_map() -> Dict[str, str]:
     """Return Pashto -> romanization map from full_dictionary.json if present."""
     if not os.path.exists(DICT_FILE):
         return {}
     try:
-        with open(DICT_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(DICT_FILE)
         entries = data.get('entries', []) if isinstance(data, dict) else data
         p2f: Dict[str, str] = {}
         for ent in entries:
@@ -43,30 +61,39 @@ def build_dict_map() -> Dict[str, str]:
 
 
 def aggregate(index: Dict[str, Any], dict_map: Dict[str, str]) -> List[Dict[str, Any]]:
-    agg: Dict[str, Dict[str, Any]] = {}
+    freq: Counter = Counter()
+    pos_map: Dict[str, str] = {}
     for root, data in index.items():
         for identity in data.get('identities', []):
-            pos = identity.get('type', '')
+            # Parsed fresh for every identity; interned so pos_map shares one copy of each
+            pos = sys.intern(identity.get('type', ''))
             for items_list in identity.get('forms', {}).values():
                 for item in items_list:
                     form_ps = (item.get('form', '') or '').replace('_', ' ')
-                    key = form_ps
-                    cur = agg.get(key)
-                    if not cur:
-                        cur = {
-                            'pashto': form_ps,
-                            'frequency': 0,
-                            'romanization': dict_map.get(form_ps, ''),
-                            'pos': pos or 'unknown',
-                        }
-                        agg[key] = cur
-                    cur['frequency'] += int(item.get('count', 0))
+                    freq[form_ps] += int(item.get('count', 0))
                     # Prefer a more specific POS if current is unknown and identity has one
-                    if cur['pos'] == 'unknown' and pos:
-                        cur['pos'] = pos
-    results = list(agg.values())
-    results.sort(key=lambda x: x['frequency'], reverse=True)
-    return results
+                    if pos_map.setdefault(form_ps, pos or 'unknown') == 'unknown' and pos:
+                        pos_map[form_ps] = pos
+    # most_common() sorts stably, so equal frequencies keep first-seen order
+    return [
+        {'pashto': form_ps, 'frequency': count, 'romanization': dict_map.get(form_ps, ''), 'pos': pos_map[form_ps]}
+        for form_ps, count in freq.most_common()
+    ]
+
+
+def write_results(results: List[Dict[str, Any]]) -> None:
+    if orjson is not None:
+        with open(OUT_FILE, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    else:
+        with open(OUT_FILE, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+def write_ndjson(results: List[Dict[str, Any]]) -> None:
+    with open(NDJSON_OUT_FILE, 'w', encoding='utf-8') as f:
+        for row in results:
+            f.write(json.dumps(row, ensure_ascii=False) + '\n')
 
 
 def main() -> int:
@@ -76,9 +103,11 @@ def main() -> int:
     index = load_index()
     dict_map = build_dict_map()
     results = aggregate(index, dict_map)
-    with open(OUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    write_results(results)
     print(f"Wrote {len(results)} entries to {OUT_FILE}")
+    if '--ndjson' in sys.argv[1:]:
+        write_ndjson(results)
+        print(f"Wrote {len(results)} entries to {NDJSON_OUT_FILE}")
     return 0
 
 
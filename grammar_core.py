@@ -0,0 +1,149 @@
+"""Helpers shared by the generate_grammar_index*.py and generate_structured_index*.py scripts."""
+
+import json
+import sys
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
+
+WORD_INDEX_PATH = 'all_txt_copies/word_index_v10_final.txt'
+
+# Arabic Yeh, Alef Maksura and Yeh with Hamza Above -> Farsi Yeh
+YEH_TABLE = str.maketrans({'ي': 'ی', 'ى': 'ی', 'ئ': 'ی'})
+
+
+@lru_cache(maxsize=None)
+def load_word_data(filepath=WORD_INDEX_PATH):
+    """Parse a word index file into {word: {'count', 'verses'}}.
+
+    Cached per path, so scripts run in one process share a single parse;
+    callers must treat the result as read-only.
+    """
+    word_data = {}
+    with open(filepath, 'r', encoding='utf-8', buffering=1 << 20) as f:
+        for line in f:
+            # Lines look like "word (count): ref, ref, ..."
+            head, _, refs_str = line.strip().partition('): ')
+            word, _, count = head.rpartition(' (')
+            if word and count.isdigit():
+                # Interned, so each ref shared by many words is held once
+                word_data[word] = {'count': int(count), 'verses': list(map(sys.intern, refs_str.split(', ')))}
+    return word_data
+
+
+def load_normalized_word_data(filepath=WORD_INDEX_PATH):
+    """Parse a word index with yeh variants normalized into {word: {'count', 'verses'}}.
+
+    Spellings that normalize to the same word are merged, and each word's
+    verses are a set of interned refs. Not cached, since callers consume it.
+    """
+    word_data = {}
+    with open(filepath, 'r', encoding='utf-8') as f:
+        # Refs are plain ASCII, so translating the whole file in one pass
+        # normalizes every word without a per-line call
+        lines = f.read().translate(YEH_TABLE).split('\n')
+    for line in lines:
+        # Lines look like "word (count): ref, ref, ..." -- the first "): " ends
+        # the head and the last " (" splits word from count, so plain
+        # partition/rpartition parse it without a regex
+        head, _, refs_str = line.strip().partition('): ')
+        word, _, count = head.rpartition(' (')
+        if word and count.isdigit():
+            verses = map(sys.intern, refs_str.split(', '))
+            if word in word_data:
+                word_data[word]['count'] += int(count)
+                word_data[word]['verses'].update(verses)
+            else:
+                word_data[word] = {'count': int(count), 'verses': set(verses)}
+    return word_data
+
+
+@lru_cache(maxsize=65536)
+def normalize_pashto_char(text):
+    """Replaces different forms of 'yeh' with a standard one."""
+    return text.translate(YEH_TABLE)
+
+
+def normalize_lexicon(lexicon):
+    """Normalizes all keys and the stem/form/root strings of each lexicon entry."""
+    normalized_lexicon = {}
+    for key, value in lexicon.items():
+        normalized_key = normalize_pashto_char(key)
+        if not isinstance(value, dict):
+            normalized_lexicon[normalized_key] = value
+            continue
+        normalized_value = value.copy()
+        if 'stems' in normalized_value:
+            normalized_value['stems'] = {k: normalize_pashto_char(v) for k, v in normalized_value['stems'].items()}
+        if 'inflected_forms' in normalized_value:
+            normalized_value['inflected_forms'] = [normalize_pashto_char(form) for form in normalized_value['inflected_forms']]
+        if 'related_roots' in normalized_value:
+            normalized_value['related_roots'] = [normalize_pashto_char(root) for root in normalized_value['related_roots']]
+        if 'base_root' in normalized_value:
+            normalized_value['base_root'] = normalize_pashto_char(normalized_value['base_root'])
+        normalized_lexicon[normalized_key] = normalized_value
+    return normalized_lexicon
+
+
+def build_trie(items):
+    """Build a dict-of-dicts trie from (key, payload) pairs; payloads live under the None key."""
+    trie = {}
+    for key, payload in items:
+        node = trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node.setdefault(None, []).append(payload)
+    return trie
+
+
+def prefix_hits(trie, word):
+    """Return the payloads of every trie key that is a prefix of word, shortest key first."""
+    node, hits = trie, []
+    for ch in word:
+        node = node.get(ch)
+        if node is None:
+            break
+        hits.extend(node.get(None, ()))
+    return hits
+
+
+# Field names for the per-form tuples collected by the v12-v15 main loops
+FORM_FIELDS = ('form', 'count', 'verses')
+
+
+def forms_to_dicts(final_index, fields=FORM_FIELDS):
+    """Expand the per-form tuples under every identity of final_index into dicts, in place.
+
+    The main loops collect (form, count, verses, ...) tuples, which are far
+    smaller than dicts, and only build the dicts once, right before writing.
+    """
+    for entry in final_index.values():
+        for identity in entry['identities']:
+            forms = identity['forms']
+            for form_description, items in forms.items():
+                forms[form_description] = [dict(zip(fields, item)) for item in items]
+
+
+def write_json(path, obj):
+    """Write obj as 2-space-indented UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        # Non-str keys are stringified as json.dump does, so both paths agree
+        option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        with open(path, 'wb') as f:
+            if not isinstance(obj, dict) or not obj:
+                f.write(orjson.dumps(obj, option=option))
+                return
+            # One top-level entry at a time, so the whole document is never
+            # held as a single buffer; each entry is dumped as a one-key
+            # object, whose inner lines are already indented for the outer one
+            sep = b'{\n  '
+            for key, value in obj.items():
+                f.write(sep + orjson.dumps({key: value}, option=option)[4:-2])
+                sep = b',\n  '
+            f.write(b'\n}')
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2)
@@ -1,13 +1,14 @@
+from bisect import bisect_left
 from collections import defaultdict
-from typing import Dict, List, Tuple, Iterable
+from typing import Dict, List, Optional, Tuple, Iterable
 
 # --- Unicode Normalization ---
+# Arabic Yeh, Alef Maksura and Yeh with Hamza Above -> Farsi Yeh
+YEH_TABLE = str.maketrans({'ي': 'ی', 'ى': 'ی', 'ئ': 'ی'})
+
 def normalize_pashto_char(text: str) -> str:
     """Normalize Pashto characters to a canonical form."""
-    replacements = {'ي': 'ی', 'ى': 'ی', 'ئ': 'ی'}
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    return text
+    return text.translate(YEH_TABLE)
 
 # --- Minimal Lexicons (excerpt from lingdocs/pashto-inflector) ---
 # These lexicons provide sample data to characterize words. In a full
@@ -38,6 +39,31 @@ IRREGULAR_NOUN_ADJ_LEXICON: Dict[str, Dict[str, object]] = {
     }
 }
 
+# Flat (match, is_exact, root, details, form_description) list, built once in
+# lexicon order: each verb's infinitive, then its stems in declaration order
+VERB_MATCHERS: List[Tuple[str, bool, str, Dict[str, Dict[str, str]], str]] = []
+for _root, _details in VERB_LEXICON.items():
+    VERB_MATCHERS.append((_root, True, _root, _details, 'Infinitive Root'))
+    for _stem_type, _stem_form in _details['stems'].items():
+        VERB_MATCHERS.append((_stem_form, False, _root, _details, f"Conjugation from {_stem_type} stem '{_stem_form}'"))
+
+# The same matchers bucketed by their first character (order kept), so a word
+# is only tested against matchers it could possibly start with
+VERB_MATCHERS_BY_FIRST: Dict[str, List[Tuple[str, bool, str, Dict[str, Dict[str, str]], str]]] = {}
+for _matcher in VERB_MATCHERS:
+    VERB_MATCHERS_BY_FIRST.setdefault(_matcher[0][:1], []).append(_matcher)
+
+# Word -> [(root, details, is_base), ...] in lexicon order: each irregular root
+# is its own base form, and each inflected form points back at its root
+IRREGULAR_FORMS: Dict[str, List[Tuple[str, Dict[str, object], bool]]] = {}
+for _root, _details in IRREGULAR_NOUN_ADJ_LEXICON.items():
+    IRREGULAR_FORMS.setdefault(_root, []).append((_root, _details, True))
+    for _form in dict.fromkeys(_details['inflected_forms']):
+        if _form != _root:
+            IRREGULAR_FORMS.setdefault(_form, []).append((_root, _details, False))
+
+PLURAL_ENDINGS = ('ان', 'انو')
+
 # --- Grammar Characterization Engine ---
 def find_all_possible_roots(word: str, all_words_set: Iterable[str]) -> List[Tuple[str, Dict[str, str]]]:
     """Find possible roots and grammatical interpretations for a word.
@@ -48,31 +74,23 @@ def find_all_possible_roots(word: str, all_words_set: Iterable[str]) -> List[Tup
     interpretations: List[Tuple[str, Dict[str, str]]] = []
 
     # 1. Verb analysis
-    for root, details in VERB_LEXICON.items():
-        if word == root:
+    for match, is_exact, root, details, desc in VERB_MATCHERS_BY_FIRST.get(word[:1], ()):
+        if word == match if is_exact else word.startswith(match):
             interpretations.append((root, {
                 'type': 'Verb',
                 'pattern_info': details['pattern_info'],
-                'form_description': 'Infinitive Root',
+                'form_description': desc,
             }))
-        for stem_type, stem_form in details['stems'].items():
-            if word.startswith(stem_form):
-                desc = f"Conjugation from {stem_type} stem '{stem_form}'"
-                interpretations.append((root, {
-                    'type': 'Verb',
-                    'pattern_info': details['pattern_info'],
-                    'form_description': desc,
-                }))
 
     # 2. Noun/Adj analysis
-    for root, details in IRREGULAR_NOUN_ADJ_LEXICON.items():
-        if word == root:
+    for root, details, is_base in IRREGULAR_FORMS.get(word, ()):
+        if is_base:
             interpretations.append((root, {
                 'type': 'Noun/Adj',
                 'pattern_info': details['pattern_info'],
                 'form_description': 'Base Form (Masc. Plain)',
             }))
-        elif word in details['inflected_forms']:
+        else:
             desc = f"Inflection of '{root}'"
             interpretations.append((root, {
                 'type': 'Noun/Adj',
@@ -81,8 +99,7 @@ def find_all_possible_roots(word: str, all_words_set: Iterable[str]) -> List[Tup
             }))
 
     # 3. Regular noun/adj analysis (simple plural rule)
-    plural_endings = ["ان", "انو"]
-    for ending in plural_endings:
+    for ending in PLURAL_ENDINGS:
         if word.endswith(ending):
             possible_root = word[:-len(ending)]
             if possible_root in all_words_set:
@@ -119,6 +136,37 @@ def search_word_forms(word: str, form_to_root_map: Dict[str, List[str]]) -> List
     return form_to_root_map.get(search_key, [])
 
 
+def build_prefix_index(form_to_root_map: Dict[str, List[str]]) -> List[str]:
+    """Return the forms of ``form_to_root_map`` sorted, for search_prefix to bisect into.
+
+    Build it once per map and pass it to search_prefix so a prefix query is a
+    bisect instead of a sort; rebuild it whenever the map changes.
+    """
+    return sorted(form_to_root_map)
+
+
+def search_prefix(
+    prefix: str,
+    form_to_root_map: Dict[str, List[str]],
+    limit: Optional[int] = None,
+    prefix_index: Optional[List[str]] = None,
+) -> List[str]:
+    """Return the forms in ``form_to_root_map`` that start with ``prefix``, sorted.
+
+    Pass ``prefix_index`` (from build_prefix_index) to skip sorting the map's
+    forms on every call.
+    """
+    search_key = normalize_pashto_char(prefix).replace(" ", "_")
+    keys = prefix_index if prefix_index is not None else build_prefix_index(form_to_root_map)
+    # Every form with the prefix sorts in one run starting at its bisect point
+    matches: List[str] = []
+    for i in range(bisect_left(keys, search_key), len(keys)):
+        if len(matches) == limit or not keys[i].startswith(search_key):
+            break
+        matches.append(keys[i])
+    return matches
+
+
 def characterize_word(word: str, all_words: Iterable[str]) -> List[Tuple[str, Dict[str, str]]]:
     """Return grammatical characterizations for ``word``.
 
@@ -0,0 +1,146 @@
+"""Compound-aware verse indexing core used by generate_compound_aware_index_v10.py.
+
+Fully annotated and free of defaultdict/closures so it can be compiled ahead of
+time with mypyc (`mypyc index_core.py`); it runs unchanged as plain Python.
+"""
+
+import io
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Optional
+
+COMPOUND_PHRASES: list[str] = [
+    "لکه څنګه چې",
+    "کړه وړه" # Keeping this here for future use
+]
+
+BOOK_MAP: dict[str, str] = {
+    'acts': 'Acts', 'colossians': 'Colossians', 'ephesians': 'Ephesians', 'galatians': 'Galatians',
+    'hebrews': 'Hebrews', 'james': 'James', 'john': 'John', 'jude': 'Jude', 'luke': 'Luke',
+    'mark': 'Mark', 'matthew': 'Matthew', 'philemon': 'Philemon', 'philippians': 'Philippians',
+    'revelation': 'Revelation', 'romans': 'Romans', 'titus': 'Titus',
+}
+
+PUNCT = '.,:;!?؟،؛"\'()[]{}“”'
+# A verse-number line is only Persian digits, whitespace and punctuation,
+# e.g. "۱۲" or "(۱۲)."; anything else is verse text.
+VERSE_NUM_RE = re.compile(r'[۰-۹\s' + re.escape(PUNCT) + r']+')
+DIGIT_RE = re.compile(r'[۰-۹]+')
+FNAME_RE = re.compile(r'([a-z]+)(\d+)_pashto\.txt')
+
+# One pass per verse: a known compound phrase (longest first, ending on a token
+# boundary) or else a run of non-space, non-punctuation characters.
+WORD_CLASS = r'[^\s' + re.escape(PUNCT) + r']'
+TOKEN_RE = re.compile(
+    '(?:' + '|'.join(re.escape(c) for c in sorted(COMPOUND_PHRASES, key=len, reverse=True)) + ')(?!' + WORD_CLASS + ')'
+    + '|' + WORD_CLASS + '+'
+)
+
+
+def persian_to_int(s: str) -> Optional[int]:
+    # Persian digits ۰-۹ are the contiguous range U+06F0..U+06F9
+    result = 0
+    for char in s:
+        d = ord(char) - 0x06F0
+        if 0 <= d <= 9: result = result * 10 + d
+        else: return None
+    return result
+
+
+def verse_number(line: str) -> Optional[int]:
+    """Return the verse number if line is a verse-number line, else None."""
+    if not VERSE_NUM_RE.fullmatch(line):
+        return None
+    digits = ''.join(DIGIT_RE.findall(line))
+    return persian_to_int(digits) if digits else None
+
+
+# One verse buffer per process, reused for every verse of every file
+verse_buf = io.StringIO()
+
+
+def ref_prefix(filename: str) -> Optional[str]:
+    """Return the "Book chapter:" ref prefix for a chapter filename, or None."""
+    match = FNAME_RE.fullmatch(filename)
+    if not match:
+        return None
+    book_prefix, chapter_str = match.group(1), match.group(2)
+    book = BOOK_MAP.get(book_prefix, book_prefix.capitalize())
+    return f"{book} {int(chapter_str)}:"
+
+
+def process_file(filepath: str, prefix: str) -> tuple[dict[str, set[str]], dict[str, int]]:
+    """Index one chapter file, returning its partial (word -> set of refs, word -> count) dicts."""
+    index: dict[str, set[str]] = {}
+    freq: dict[str, int] = {}
+    with open(filepath, 'r', encoding='utf-8', buffering=1 << 20) as f:
+        current_verse: Optional[int] = None
+        verse_buf.seek(0); verse_buf.truncate()
+        # A trailing None sentinel closes the last verse at the same emit site
+        line: Optional[str]
+        for line in chain(f, (None,)):
+            verse_num: Optional[int]
+            if line is None:
+                verse_num, at_boundary = None, True
+            else:
+                verse_num = verse_number(line)
+                at_boundary = verse_num is not None
+
+            if at_boundary:
+                if current_verse is not None:
+                    ref = sys.intern(prefix + str(current_verse))
+                    for m in TOKEN_RE.finditer(verse_buf.getvalue()):
+                        word = m.group(0).replace(' ', '_')
+                        refs = index.get(word)
+                        if refs is None:
+                            index[word] = refs = set()
+                        refs.add(ref)
+                        freq[word] = freq.get(word, 0) + 1
+                current_verse = verse_num
+                verse_buf.seek(0); verse_buf.truncate()
+            elif current_verse is not None and line is not None:
+                verse_buf.write(line.rstrip('\n')); verse_buf.write(' ')
+    return index, freq
+
+
+# Below this many chapter files, process startup costs more than it saves
+PARALLEL_MIN_FILES: int = 16
+
+
+def build_index(txt_dir: str) -> tuple[dict[str, list[str]], dict[str, int]]:
+    """Index every *_pashto.txt chapter in txt_dir.
+
+    Returns (word -> sorted verse refs, word -> occurrence count).
+    """
+    paths: list[str] = []
+    prefixes: list[str] = []
+    with os.scandir(txt_dir) as it:
+        entries = sorted((e for e in it if e.is_file()), key=lambda e: e.name)
+    for entry in entries:
+        prefix = ref_prefix(entry.name)
+        if prefix is not None:
+            paths.append(entry.path)
+            prefixes.append(prefix)
+    if len(paths) < PARALLEL_MIN_FILES:
+        results = list(map(process_file, paths, prefixes))
+    else:
+        with ProcessPoolExecutor() as ex:
+            results = list(ex.map(process_file, paths, prefixes, chunksize=4))
+
+    merged: dict[str, set[str]] = {}
+    freq: dict[str, int] = {}
+    for partial_index, partial_freq in results:
+        for w, refs in partial_index.items():
+            seen = merged.get(w)
+            if seen is None:
+                merged[w] = set(refs)
+            else:
+                seen |= refs
+        for w, c in partial_freq.items():
+            freq[w] = freq.get(w, 0) + c
+
+    index: dict[str, list[str]] = {w: sorted(refs) for w, refs in merged.items()}
+    return index, freq
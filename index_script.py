@@ -1,14 +1,16 @@
 import os
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 # Function to convert Persian/Pashto digits to integer
 def persian_to_int(s):
-    persian_digits = {'۰': 0, '۱': 1, '۲': 2, '۳': 3, '۴': 4, '۵': 5, '۶': 6, '۷': 7, '۸': 8, '۹': 9}
+    # Persian digits ۰-۹ are the contiguous range U+06F0..U+06F9
     result = 0
     for char in s:
-        if char in persian_digits:
-            result = result * 10 + persian_digits[char]
+        d = ord(char) - 0x06F0
+        if 0 <= d <= 9:
+            result = result * 10 + d
         else:
             return None
     return result
@@ -33,63 +35,75 @@ book_map = {
     'titus': 'Titus',
 }
 
-index = defaultdict(list)
-freq = defaultdict(int)
 punct = '.,:;!?؟،؛"\'()[]{}“”'
+punct_trans = str.maketrans('', '', punct)
 
 txt_dir = 'all_txt_copies'
-for filename in os.listdir(txt_dir):
-    if filename.endswith('_pashto.txt'):
-        base = filename.replace('_pashto.txt', '')
-        match = re.match(r'([a-z]+)(\d+)', base)
-        if match:
-            book_prefix = match.group(1)
-            chapter = int(match.group(2))
-            book = book_map.get(book_prefix, book_prefix.capitalize())
 
-            filepath = os.path.join(txt_dir, filename)
-            with open(filepath, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+def iter_verses(filepath, book, chapter):
+    """Yield (ref, text) for each verse of a chapter file, streaming its lines."""
+    current_verse = None
+    verse_text = []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            stripped = line.strip()
+            verse_num = persian_to_int(stripped)
+            if verse_num is not None:
+                if current_verse is not None:
+                    yield f"{book} {chapter}:{current_verse}", ' '.join(verse_text)
+                current_verse = verse_num
+                verse_text = []
+            elif current_verse is not None:
+                verse_text.append(stripped)
 
-            current_verse = None
-            verse_text = []
-            for line in lines:
-                stripped = line.strip()
-                verse_num = persian_to_int(stripped)
-                if verse_num is not None:
-                    if current_verse is not None:
-                        text = ' '.join(verse_text).strip()
-                        words = re.split(r'\s+', text)
-                        ref = f"{book} {chapter}:{current_verse}"
-                        for word in words:
-                            clean_word = word.strip(punct)
-                            if clean_word:
-                                index[clean_word].append(ref)
-                                freq[clean_word] += 1
-                    current_verse = verse_num
-                    verse_text = []
-                elif current_verse is not None:
-                    verse_text.append(stripped)
+    # The last verse has no following number to close it
+    if current_verse is not None:
+        yield f"{book} {chapter}:{current_verse}", ' '.join(verse_text)
 
-            # Process the last verse
-            if current_verse is not None:
-                text = ' '.join(verse_text).strip()
-                words = re.split(r'\s+', text)
-                ref = f"{book} {chapter}:{current_verse}"
-                for word in words:
-                    clean_word = word.strip(punct)
-                    if clean_word:
-                        index[clean_word].append(ref)
-                        freq[clean_word] += 1
+def process_file(filename):
+    """Return ({word: set of refs}, Counter of words) for one chapter file."""
+    index = defaultdict(set)
+    freq = Counter()
+    base = filename.replace('_pashto.txt', '')
+    match = re.match(r'([a-z]+)(\d+)', base)
+    if not match:
+        return index, freq
+    book_prefix = match.group(1)
+    chapter = int(match.group(2))
+    book = book_map.get(book_prefix, book_prefix.capitalize())
 
-# Sort words by frequency descending
-sorted_words = sorted(freq.items(), key=lambda x: x[1], reverse=True)
+    for ref, text in iter_verses(os.path.join(txt_dir, filename), book, chapter):
+        # Stripping punctuation never touches whitespace, so one
+        # translate over the verse and a plain split() yield the
+        # same non-empty words as cleaning each token in turn
+        for clean_word in text.translate(punct_trans).split():
+            index[clean_word].add(ref)
+            freq[clean_word] += 1
+    return index, freq
 
-# Output to file
-output_file = os.path.join(txt_dir, 'word_index.txt')
-with open(output_file, 'w', encoding='utf-8') as out:
-    for word, count in sorted_words:
-        unique_verses = ', '.join(sorted(set(index[word])))
-        out.write(f"{word} ({count}): {unique_verses}\n")
+if __name__ == '__main__':
+    files = [filename for filename in os.listdir(txt_dir) if filename.endswith('_pashto.txt')]
 
-print("Index created in", output_file) 
\ No newline at end of file
+    # Chapters are independent, so they are tokenized in worker processes and
+    # merged here in listing order (map, not as-completed, keeps ties in the
+    # frequency sort in the same order as a sequential run)
+    index = defaultdict(set)
+    freq = Counter()
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for file_index, file_freq in ex.map(process_file, files, chunksize=max(1, len(files) // workers)):
+            for word, refs in file_index.items():
+                index[word] |= refs
+            freq.update(file_freq)
+
+    # Sort words by frequency descending
+    sorted_words = sorted(freq.items(), key=lambda x: x[1], reverse=True)
+
+    # Output to file
+    output_file = os.path.join(txt_dir, 'word_index.txt')
+    with open(output_file, 'w', encoding='utf-8') as out:
+        for word, count in sorted_words:
+            unique_verses = ', '.join(sorted(index[word]))
+            out.write(f"{word} ({count}): {unique_verses}\n")
+
+    print("Index created in", output_file)
@@ -1,6 +1,7 @@
 import json
 import os
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Callable, Dict, Any, Optional
 
 APP_ROOT = os.path.dirname(os.path.abspath(__file__))
 LEXICON_PATH = os.path.join(APP_ROOT, 'nouns_lexicon.json')
@@ -98,24 +99,32 @@ def _pattern_half_fem_inanim_ee(lemma: str) -> Dict[str, tuple]:
     }
 
 
+# Pattern name -> forms builder
+PATTERN_BUILDERS: Dict[str, Callable[[str], Dict[str, tuple]]] = {
+    'masc_basic_consonant': _pattern_1_basic,
+    'basic': _pattern_1_basic,
+    'pashtoon': _pattern_4_pashtoon,
+    'unstressed_y': _pattern_2_unstressed_y,
+    'stressed_ay': _pattern_3_stressed_ay,
+    'short_squish': _pattern_5_short_squish,
+    'fem_inanim_ee': _pattern_half_fem_inanim_ee,
+}
+
+
+@lru_cache(maxsize=None)
 def inflect_noun(lemma: str, pattern: Optional[str] = None) -> Dict[str, Any]:
+    """Inflect a lemma; cached per (lemma, pattern), so callers must treat the result as read-only."""
     entry = NOUNS.get(lemma, {})
     pat = pattern or entry.get('pattern') or infer_default_pattern(lemma)
 
-    if pat in ('masc_basic_consonant', 'basic'):
-        forms = _pattern_1_basic(lemma)
-    elif pat == 'pashtoon':
-        forms = _pattern_4_pashtoon(lemma)
-    elif pat == 'unstressed_y':
-        forms = _pattern_2_unstressed_y(lemma)
-    elif pat == 'stressed_ay':
-        forms = _pattern_3_stressed_ay(lemma)
-    elif pat == 'short_squish':
-        forms = _pattern_5_short_squish(lemma)
-    elif pat == 'fem_inanim_ee':
-        forms = _pattern_half_fem_inanim_ee(lemma)
+    stored_forms = entry.get('forms') if pattern is None else None
+    if stored_forms:
+        # The lexicon may list a lemma's forms outright (irregular nouns, or
+        # a lexicon filled in by write_forms_into_lexicon); take them as given
+        forms = {slot: tuple(value) for slot, value in stored_forms.items()}
     else:
-        forms = {}
+        builder = PATTERN_BUILDERS.get(pat)
+        forms = builder(lemma) if builder is not None else {}
 
     return {
         'meta': {
@@ -127,9 +136,25 @@ def inflect_noun(lemma: str, pattern: Optional[str] = None) -> Dict[str, Any]:
     }
 
 
+def write_forms_into_lexicon(path: str = LEXICON_PATH) -> None:
+    """Store every lemma's generated forms in its lexicon entry, so inflect_noun can skip the pattern.
+
+    Meant as a build step: once written, a lemma's 'forms' win over its
+    'pattern', so delete them before re-running after a pattern change.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        lexicon = json.load(f)
+    for lemma, entry in lexicon.items():
+        entry['forms'] = inflect_noun(lemma, entry.get('pattern') or infer_default_pattern(lemma))['forms']
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(lexicon, f, ensure_ascii=False, indent=2)
+
+
 # --- Helpers to map forms to lemmas ---
 
+@lru_cache(maxsize=1)
 def build_noun_forms_index() -> Dict[str, str]:
+    """Map every generated form (and each lemma) to its lemma; built once, read-only."""
     index: Dict[str, str] = {}
     for lemma in NOUNS.keys():
         data = inflect_noun(lemma)
@@ -12,22 +12,50 @@ Notes:
   `/{slug}/{slug}-<n>` on chapter 1 page.
 - Extracts verses by stripping HTML and capturing lines that begin with a
   verse number (Arabic/Indic digits supported) followed by text.
-- Designed to be idempotent; re-scraping overwrites files.
+- Designed to be idempotent; re-scraping overwrites files. Pages are cached
+  under `ot_txt_copies/.http_cache/` and revalidated with conditional GETs;
+  pass `--force` to ignore the cache.
 """
 
 from __future__ import annotations
 
+import atexit
+import hashlib
+import json
 import os
 import re
+import sys
 import time
 import html
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE = "https://afghanbibles.org/eng/pashto-bible"
 DIALECT = "afeastern"
 OUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ot_txt_copies")
 os.makedirs(OUT_DIR, exist_ok=True)
 
+# Fetched pages are kept here keyed by URL hash, with their ETag/Last-Modified,
+# so re-runs revalidate with a conditional GET instead of re-downloading.
+# `--force` ignores the cache (set from the command line)
+CACHE_DIR = os.path.join(OUT_DIR, ".http_cache")
+FORCE_REFETCH = False
+
+# Chapters are fetched by a few worker threads over one keep-alive session;
+# transient server errors and 429s are retried with backoff
+MAX_WORKERS = 6
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=MAX_WORKERS,
+    pool_maxsize=MAX_WORKERS,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+))
+atexit.register(SESSION.close)
+
 # Ordered list of Old Testament book slugs used by Afghan Bibles
 OT_BOOK_SLUGS = [
     "genesis",
@@ -77,7 +105,12 @@ SCRIPTURE_DIV_RE = re.compile(r"<div id=\"scripture\"[\s\S]*?>([\s\S]*?)</div>\s
 VERSE_BLOCK_RE = re.compile(r"<span class=\"verseno c\"[^>]*id=\"v(\d+)\"[^>]*>.*?</span>([\s\S]*?)<span class=\"endverse\"></span>", re.IGNORECASE)
 TAG_RE = re.compile(r"<[^>]+>")
 WS_RE = re.compile(r"\s+")
-VERSE_LINE_RE = re.compile(r"^\s*([0-9\u06F0-\u06F9\u0660-\u0669]+)\s+(.*)")
+SCRIPT_RE = re.compile(r"<script[\s\S]*?</script>", re.IGNORECASE)
+STYLE_RE = re.compile(r"<style[\s\S]*?</style>", re.IGNORECASE)
+BLOCK_TAG_RE = re.compile(r"<(br|p|div|li|h\d)[^>]*>", re.IGNORECASE)
+NEWLINE_RUN_RE = re.compile(r"\s*\n\s*")
+OPTION_RE = re.compile(r"<option value='(\d+)'[^>]*>\1</option>")
+LEADING_NUM_RE = re.compile(r"^[0-9\u06F0-\u06F9\u0660-\u0669]+")
 
 
 def build_chapter_url(book_slug: str, chapter: int) -> str:
@@ -85,31 +118,78 @@ def build_chapter_url(book_slug: str, chapter: int) -> str:
     return f"{base}?prefdialect={DIALECT}"
 
 
-def fetch(url: str) -> str:
-    resp = requests.get(url, timeout=45)
+class RateLimiter:
+    """Space request starts at least 1 / rate_per_sec seconds apart, across threads."""
+
+    def __init__(self, rate_per_sec: float) -> None:
+        self.interval = 1.0 / rate_per_sec
+        self.lock = threading.Lock()
+        self.next_start = time.monotonic()
+
+    def acquire(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def fetch(url: str, limiter: RateLimiter | None = None) -> str:
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    body_path = os.path.join(CACHE_DIR, f"{key}.html")
+    meta_path = os.path.join(CACHE_DIR, f"{key}.meta.json")
+    headers = {}
+    if not FORCE_REFETCH and os.path.exists(body_path) and os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    if limiter is not None:
+        limiter.acquire()
+    resp = SESSION.get(url, timeout=45, headers=headers)
+    if resp.status_code == 304 and headers:
+        with open(body_path, "r", encoding="utf-8") as f:
+            return f.read()
     resp.raise_for_status()
-    return resp.text
+    # Decode the body once, as resp.text would, but fall back to UTF-8 rather
+    # than running charset detection over the whole page when none is declared
+    text = resp.content.decode(resp.encoding or "utf-8", errors="replace")
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Temp file plus atomic swap for each, body first and meta last, so an
+    # interrupted run never pairs a valid ETag with a truncated body
+    with open(body_path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(body_path + ".tmp", body_path)
+    with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified")}, f)
+    os.replace(meta_path + ".tmp", meta_path)
+    return text
 
 
 def html_to_text(html_str: str) -> str:
     # Remove scripts/styles
-    cleaned = re.sub(r"<script[\s\S]*?</script>", " ", html_str, flags=re.IGNORECASE)
-    cleaned = re.sub(r"<style[\s\S]*?</style>", " ", cleaned, flags=re.IGNORECASE)
+    cleaned = SCRIPT_RE.sub(" ", html_str)
+    cleaned = STYLE_RE.sub(" ", cleaned)
     # Replace <br> and <p> with newlines to preserve breaks
-    cleaned = re.sub(r"<(br|p|div|li|h\d)[^>]*>", "\n", cleaned, flags=re.IGNORECASE)
+    cleaned = BLOCK_TAG_RE.sub("\n", cleaned)
     cleaned = TAG_RE.sub(" ", cleaned)
     cleaned = html.unescape(cleaned)
     cleaned = WS_RE.sub(" ", cleaned)
     # Normalize line breaks
-    cleaned = re.sub(r"\s*\n\s*", "\n", cleaned)
+    cleaned = NEWLINE_RUN_RE.sub("\n", cleaned)
     return cleaned.strip()
 
 
-def detect_max_chapter(book_slug: str) -> int:
+def detect_max_chapter(book_slug: str, limiter: RateLimiter | None = None) -> int:
     # Inspect chapter 1 page for navigation select options
     url = build_chapter_url(book_slug, 1)
-    doc = fetch(url)
-    options = re.findall(rf"<option value='(\d+)'[^>]*>\1</option>", doc)
+    doc = fetch(url, limiter)
+    options = OPTION_RE.findall(doc)
     if options:
         try:
             return max(int(x) for x in options)
@@ -133,9 +213,9 @@ def extract_verses_from_page(html_doc: str) -> list[str]:
         body_txt = html_to_text(body_html)
         body_txt = body_txt.replace('\u00a0', ' ').strip()
         # Collapse multiple newlines, join with spaces
-        body_txt = re.sub(r"\s*\n\s*", " ", body_txt)
+        body_txt = NEWLINE_RUN_RE.sub(" ", body_txt)
         # Prefix Arabic/Persian verse number as-is if present in page; otherwise use vn
-        num_match = re.search(r"^[0-9\u06F0-\u06F9\u0660-\u0669]+", body_html)
+        num_match = LEADING_NUM_RE.search(body_html)
         display_num = num_match.group(0) if num_match else vn
         verses.append(f"{display_num} {body_txt}")
     return verses
@@ -144,35 +224,55 @@ def extract_verses_from_page(html_doc: str) -> list[str]:
 def save_chapter(book_slug: str, chapter: int, verses: list[str]) -> None:
     fname = f"{book_slug.replace('-', '')}{chapter}_pashto.txt"
     path = os.path.join(OUT_DIR, fname)
-    with open(path, "w", encoding="utf-8") as f:
-        for v in verses:
-            f.write(v.strip() + "\n")
+    # One write to a temp file, then an atomic swap, so an interrupted run
+    # never leaves a half-written chapter behind
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("".join(v.strip() + "\n" for v in verses))
+    os.replace(tmp_path, path)
+
+
+def scrape_chapters(chapters: list[tuple[str, int]], limiter: RateLimiter) -> None:
+    """Fetch (book_slug, chapter) pages concurrently; parse and save each here as it completes."""
+    # Requests overlap, but still start no faster than the limiter allows
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        futures = {
+            ex.submit(fetch, build_chapter_url(book_slug, ch), limiter): (book_slug, ch)
+            for book_slug, ch in chapters
+        }
+        for future in as_completed(futures):
+            book_slug, ch = futures[future]
+            try:
+                verses = extract_verses_from_page(future.result())
+                save_chapter(book_slug, ch, verses)
+                print(f"  saved {book_slug} {ch}: {len(verses)} lines")
+            except Exception as e:
+                print(f"  [ERROR] {book_slug} {ch}: {e}")
 
 
 def scrape_book(book_slug: str, delay_sec: float = 0.6) -> None:
     print(f"{book_slug}: scraping chapters (auto-follow)")
-    ch = 1
-    max_ch = detect_max_chapter(book_slug)
-    while ch <= max_ch:
-        url = build_chapter_url(book_slug, ch)
-        try:
-            html_doc = fetch(url)
-            verses = extract_verses_from_page(html_doc)
-            save_chapter(book_slug, ch, verses)
-            print(f"  saved {book_slug} {ch}: {len(verses)} lines")
-            ch += 1
-            time.sleep(delay_sec)
-        except Exception as e:
-            print(f"  [ERROR] {book_slug} {ch}: {e}")
-            ch += 1
+    # One limiter paces the chapter-count request and every chapter after it
+    limiter = RateLimiter(1.0 / delay_sec)
+    max_ch = detect_max_chapter(book_slug, limiter)
+    scrape_chapters([(book_slug, ch) for ch in range(1, max_ch + 1)], limiter)
 
 
 def scrape_all_ot() -> None:
+    # Chapter counts first (one page per book), then every chapter of every
+    # book through one pool, so no book waits on the previous one's stragglers.
+    # One limiter paces both passes, so the count requests are throttled too
+    limiter = RateLimiter(1.0 / 0.8)
+    chapters: list[tuple[str, int]] = []
     for slug in OT_BOOK_SLUGS:
-        scrape_book(slug, delay_sec=0.8)
+        max_ch = detect_max_chapter(slug, limiter)
+        print(f"{slug}: {max_ch} chapters")
+        chapters.extend((slug, ch) for ch in range(1, max_ch + 1))
+    scrape_chapters(chapters, limiter)
 
 
 if __name__ == "__main__":
+    FORCE_REFETCH = "--force" in sys.argv[1:]
     scrape_all_ot()
 
 
@@ -1,14 +1,17 @@
 """Utility functions for searching Pashto Bible text and grammar index."""
 from collections import defaultdict
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 
+# Arabic Yeh, Alef Maksura and Yeh with Hamza Above -> Farsi Yeh
+YEH_TABLE = str.maketrans({'ي': 'ی', 'ى': 'ی', 'ئ': 'ی'})
+
+# Cached: the index walks below normalize the same few thousand forms over and over
+@lru_cache(maxsize=65536)
 def normalize_pashto_char(text: str) -> str:
     """Normalize variant Pashto characters to a canonical form."""
-    replacements = {'ي': 'ی', 'ى': 'ی', 'ئ': 'ی'}
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    return text
+    return text.translate(YEH_TABLE)
 
 
 def create_form_to_root_map(grammatical_index: Dict[str, Any]) -> Dict[str, List[str]]:
@@ -24,17 +27,61 @@ def create_form_to_root_map(grammatical_index: Dict[str, Any]) -> Dict[str, List
     return form_map
 
 
+def build_form_hits_index(grammatical_index: Dict[str, Any]) -> Dict[str, List[Tuple[str, Dict[str, Any], str, Dict[str, Any]]]]:
+    """Map each normalized form to its (root, identity, description, item) entries, in index order.
+
+    Lets search_grammatical_forms go straight to the matching items instead of
+    scanning every form under every candidate root.
+    """
+    hits: Dict[str, List[Tuple[str, Dict[str, Any], str, Dict[str, Any]]]] = defaultdict(list)
+    for root, data in grammatical_index.items():
+        for identity in data.get('identities', []):
+            for desc, items in identity.get('forms', {}).items():
+                for item in items:
+                    hits[normalize_pashto_char(item['form'])].append((root, identity, desc, item))
+    return hits
+
+
+def _form_result(root: str, identity: Dict[str, Any], desc: str, item: Dict[str, Any]) -> Dict[str, Any]:
+    raw_type = identity.get('type') or ''
+    pattern_info = identity.get('pattern_info', '') or ''
+    inferred_type = raw_type
+    if not inferred_type or inferred_type == 'N/A':
+        if 'Verb' in pattern_info:
+            inferred_type = 'Verb'
+        elif ('Noun' in pattern_info) or ('Adj' in pattern_info):
+            inferred_type = 'Noun/Adj'
+        else:
+            inferred_type = 'Unknown'
+    return {
+        'root': root,
+        'type': inferred_type,
+        'pattern': identity.get('pattern_info', 'N/A'),
+        'description': desc,
+        'form': item.get('form', ''),
+        'translit': item.get('translit', ''),
+        'verses': item.get('verses', []),
+        'count': item.get('count', 0),
+    }
+
+
 def search_grammatical_forms(
     word: str,
     form_to_root_map: Dict[str, List[str]],
     grammatical_index: Dict[str, Any],
+    form_hits_index: Optional[Dict[str, List[Tuple[str, Dict[str, Any], str, Dict[str, Any]]]]] = None,
 ) -> List[Dict[str, Any]]:
     """Return grammar details for a normalized word form.
 
     Each result contains the root, word type, pattern information, and
-    occurrences of the specific form.
+    occurrences of the specific form. Pass ``form_hits_index`` (from
+    build_form_hits_index) to look the form up directly instead of scanning
+    the forms under each root in ``form_to_root_map``.
     """
     search_key = normalize_pashto_char(word).replace(" ", "_")
+    if form_hits_index is not None:
+        return [_form_result(*hit) for hit in form_hits_index.get(search_key, ())]
+
     root_words = form_to_root_map.get(search_key, [])
     results: List[Dict[str, Any]] = []
 
@@ -44,28 +91,7 @@ def search_grammatical_forms(
             for desc, items in identity.get('forms', {}).items():
                 for item in items:
                     if normalize_pashto_char(item['form']) == search_key:
-                        raw_type = identity.get('type') or ''
-                        pattern_info = identity.get('pattern_info', '') or ''
-                        inferred_type = raw_type
-                        if not inferred_type or inferred_type == 'N/A':
-                            if 'Verb' in pattern_info:
-                                inferred_type = 'Verb'
-                            elif ('Noun' in pattern_info) or ('Adj' in pattern_info):
-                                inferred_type = 'Noun/Adj'
-                            else:
-                                inferred_type = 'Unknown'
-                        results.append(
-                            {
-                                'root': root,
-                                'type': inferred_type,
-                                'pattern': identity.get('pattern_info', 'N/A'),
-                                'description': desc,
-                                'form': item.get('form', ''),
-                                'translit': item.get('translit', ''),
-                                'verses': item.get('verses', []),
-                                'count': item.get('count', 0),
-                            }
-                        )
+                        results.append(_form_result(root, identity, desc, item))
     return results
 
 
@@ -101,25 +127,18 @@ def get_form_occurrences_any(
     norm = normalize_pashto_char(form_ps)
     # form_to_root_map was built using normalize_pashto_char(item['form'])
     candidate_roots = set(form_to_root_map.get(norm, []))
+    if not candidate_roots:
+        return {'count': 0, 'verses': []}
     total_count = 0
     verses: List[str] = []
 
-    def matches(a: str, b: str) -> bool:
-        a1 = normalize_pashto_char(a)
-        b1 = normalize_pashto_char(b)
-        if a1 == b1:
-            return True
-        # also try replacing spaces/underscores equivalently
-        a2 = a1.replace(' ', '_')
-        b2 = b1.replace(' ', '_')
-        return a2 == b2
-
+    # Same normalization as the map keys, so an exact compare finds the items
     for root in candidate_roots:
         root_data = grammatical_index.get(root, {})
         for identity in root_data.get('identities', []):
             for items_list in identity.get('forms', {}).values():
                 for item in items_list:
-                    if matches(item.get('form', ''), form_ps):
+                    if normalize_pashto_char(item.get('form', '')) == norm:
                         total_count += int(item.get('count', 0))
                         verses.extend(item.get('verses', []))
 
@@ -130,6 +149,7 @@ def build_form_occurrence_index(grammatical_index: Dict[str, Any]) -> Dict[str,
     """Precompute a map of normalized form -> {'count': int, 'verses': List[str]} aggregated across roots.
 
     This makes per-form lookup O(1) and dramatically speeds up UI rendering.
+    Verses are listed once each, in first-seen order.
     """
     aggregate: Dict[str, Dict[str, Any]] = {}
 
@@ -137,10 +157,12 @@ def build_form_occurrence_index(grammatical_index: Dict[str, Any]) -> Dict[str,
         # Normalize to Pashto form (spaces, not underscores) for key
         form_ps = form.replace('_', ' ')
         key = normalize_pashto_char(form_ps)
-        if key not in aggregate:
-            aggregate[key] = {'count': 0, 'verses': []}
-        aggregate[key]['count'] += int(count)
-        aggregate[key]['verses'].extend(verses)
+        entry = aggregate.get(key)
+        if entry is None:
+            # verses is a dict used as an ordered set until the walk is done
+            aggregate[key] = entry = {'count': 0, 'verses': {}}
+        entry['count'] += count
+        entry['verses'].update(dict.fromkeys(verses))
 
     for root_data in grammatical_index.values():
         for identity in root_data.get('identities', []):
@@ -148,5 +170,7 @@ def build_form_occurrence_index(grammatical_index: Dict[str, Any]) -> Dict[str,
                 for item in items_list:
                     add(item.get('form', ''), item.get('count', 0), item.get('verses', []))
 
+    for entry in aggregate.values():
+        entry['verses'] = list(entry['verses'])
     return aggregate
 
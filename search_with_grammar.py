@@ -1,6 +1,9 @@
-import re
+import sys
+from functools import lru_cache
 from typing import Dict, List
 
+from grammar_core import build_trie, prefix_hits
+
 # The inflection and part-of-speech heuristics below are adapted from
 # generate_structured_index.py. They loosely follow patterns described on
 # https://grammar.lingdocs.com and serve as a light-weight substitute for the
@@ -10,13 +13,38 @@ verb_suffixes = ['ول', 'وي', 'ېده', 'ېدل', 'ېږم', 'ېږې', 'ېږي
 noun_suffixes = ['ګانې', 'ګی', 'ګۍ', 'انه', 'ونه', 'ان', 'ه']
 adj_suffixes = ['جنه', 'جنې']
 
-known_pronouns = ['زه', 'ته', 'هغه', 'هغې', 'هغوی', 'مونږ', 'تاسو', 'دا', 'دې', 'چې', 'څوک', 'ځان']
-known_preps_posts = ['د', 'په', 'له', 'ته', 'کې', 'سره', 'لپاره', 'باندې', 'لاندې', 'پورې', 'پرته', 'پر']
-known_adverbs = ['نو', 'بیا', 'هم', 'چېرته', 'کله', 'څنګه', 'ولې', 'ډېر', 'لږ']
-known_conjunctions = ['او', 'خو', 'که']
-
+# Closed-class words, checked first on every call
+known_pronouns = frozenset({'زه', 'ته', 'هغه', 'هغې', 'هغوی', 'مونږ', 'تاسو', 'دا', 'دې', 'چې', 'څوک', 'ځان'})
+known_preps_posts = frozenset({'د', 'په', 'له', 'ته', 'کې', 'سره', 'لپاره', 'باندې', 'لاندې', 'پورې', 'پرته', 'پر'})
+known_adverbs = frozenset({'نو', 'بیا', 'هم', 'چېرته', 'کله', 'څنګه', 'ولې', 'ډېر', 'لږ'})
+known_conjunctions = frozenset({'او', 'خو', 'که'})
+
+# Longest suffix first, sorted once rather than on every call
+_VERB_SUF_SORTED = sorted(verb_suffixes, key=len, reverse=True)
+_NOUN_SUF_SORTED = sorted(noun_suffixes, key=len, reverse=True)
+_ADJ_SUF_SORTED = sorted(adj_suffixes, key=len, reverse=True)
+
+# Every suffix of every class in one trie, keyed by the reversed suffix, so a
+# single walk of the reversed word finds all matching suffixes. Payloads are
+# (class rank, suffix, part of speech, minimum root length); verbs outrank
+# nouns, which outrank adjectives, as the separate scans used to check them
+SUFFIX_TRIE = build_trie(
+    (suf[::-1], (rank, suf, pos, min_root))
+    for rank, (pos, suffixes, min_root) in enumerate((
+        ('verb', _VERB_SUF_SORTED, 2),
+        ('noun', _NOUN_SUF_SORTED, 1),  # Noun roots can be short
+        ('adjective', _ADJ_SUF_SORTED, 2),
+    ))
+    for suf in suffixes
+)
+
+@lru_cache(maxsize=200_000)
 def infer_root_and_pos(word: str):
-    """Infer a rough root and part of speech for a Pashto word."""
+    """Infer a rough root and part of speech for a Pashto word.
+
+    Cached per word; call infer_root_and_pos.cache_clear() after editing
+    the suffix or closed-class word lists.
+    """
     if word in known_pronouns:
         return word, 'pronoun', ''
     if word in known_preps_posts:
@@ -26,38 +54,37 @@ def infer_root_and_pos(word: str):
     if word in known_conjunctions:
         return word, 'conjunction', ''
 
-    for suf in sorted(verb_suffixes, key=len, reverse=True):
-        if word.endswith(suf):
-            root = word[:-len(suf)]
-            if len(root) >= 2:
-                return root, 'verb', suf
-
-    for suf in sorted(noun_suffixes, key=len, reverse=True):
-        if word.endswith(suf):
-            root = word[:-len(suf)]
-            if len(root) >= 1:
-                return root, 'noun', suf
-
-    for suf in sorted(adj_suffixes, key=len, reverse=True):
-        if word.endswith(suf):
-            root = word[:-len(suf)]
-            if len(root) >= 2:
-                return root, 'adjective', suf
+    best = None
+    for hit in prefix_hits(SUFFIX_TRIE, word[::-1]):
+        rank, suf, _, min_root = hit
+        # Hits come shortest first, so a later hit of the same rank is longer
+        if len(word) - len(suf) >= min_root and (best is None or rank <= best[0]):
+            best = hit
+    if best is not None:
+        _, suf, pos, _ = best
+        return word[:-len(suf)], pos, suf
 
     return word, 'other', ''
 
 
+@lru_cache(maxsize=None)
 def load_word_index(filepath: str = 'all_txt_copies/word_index.txt') -> Dict[str, Dict[str, object]]:
-    """Load the pre-generated word index into a dictionary."""
+    """Load the pre-generated word index into a dictionary.
+
+    Cached per path, so search_word calls without an index share one parse;
+    callers must treat the result as read-only, and call
+    load_word_index.cache_clear() to pick up a regenerated file.
+    """
     word_data: Dict[str, Dict[str, object]] = {}
     with open(filepath, 'r', encoding='utf-8') as f:
         for line in f:
-            if line.strip():
-                match = re.match(r'^(.*?) \((\d+)\): (.*)$', line.strip())
-                if match:
-                    word, count, refs_str = match.groups()
-                    refs = refs_str.split(', ')
-                    word_data[word] = {'count': int(count), 'verses': refs}
+            # Lines look like "word (count): ref, ref, ..."; split on the
+            # first "): " and the last " (" before it, no regex needed
+            head, _, refs_str = line.strip().partition('): ')
+            word, _, count = head.rpartition(' (')
+            if word and count.isdigit():
+                # Interned, so each ref shared by many words is held once
+                word_data[word] = {'count': int(count), 'verses': list(map(sys.intern, refs_str.split(', ')))}
     return word_data
 
 
@@ -81,6 +108,13 @@ def search_and_characterize(word: str, index: Dict[str, Dict[str, object]] = Non
         'suffix': suffix,
     }
 
+
+def search_and_characterize_many(words: List[str], index: Dict[str, Dict[str, object]] = None) -> List[Dict[str, object]]:
+    """search_and_characterize for many words, resolving the index once up front."""
+    if index is None:
+        index = load_word_index()
+    return [search_and_characterize(word, index) for word in words]
+
 if __name__ == '__main__':
     # Example usage for manual testing
     import json
@@ -1,13 +1,22 @@
 import json
 import os
+from functools import lru_cache
 from typing import Dict, Any, List
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
+
 APP_ROOT = os.path.dirname(os.path.abspath(__file__))
 LEXICON_PATH = os.path.join(APP_ROOT, 'verbs_lexicon.json')
 
 
 def load_lexicon() -> Dict[str, Any]:
     try:
+        if orjson is not None:
+            with open(LEXICON_PATH, 'rb') as f:
+                return orjson.loads(f.read())
         with open(LEXICON_PATH, 'r', encoding='utf-8') as f:
             return json.load(f)
     except Exception:
@@ -38,7 +47,14 @@ PAST_ENDINGS = {
 }
 
 
+def _build(stem_ps: str, stem_rom: str, endings: Dict[str, tuple]) -> Dict[str, tuple]:
+    """Attach each person's (Pashto, romanized) ending to a stem."""
+    return {person: (stem_ps + ps, stem_rom + rom) for person, (ps, rom) in endings.items()}
+
+
+@lru_cache(maxsize=4096)
 def conjugate_verb(root: str) -> Dict[str, Any]:
+    """Conjugate a lexicon verb; cached per root, so callers must treat the result as read-only."""
     v = VERBS.get(root)
     if not v:
         return {}
@@ -49,48 +65,25 @@ def conjugate_verb(root: str) -> Dict[str, Any]:
     perfective_root = v['roots']['perfective']      # ولیدل
     past_participle = v['past_participle']          # لیدلی
 
-    impf_stem_rom = v['romanization']['imperfective_stem']
-    perf_stem_rom = v['romanization']['perfective_stem']
-    part_rom = v['romanization']['past_participle']
-
-    def build_present(stem_ps, stem_rom):
-        return {
-            '1sg': (stem_ps + PRESENT_ENDINGS['1sg'][0], stem_rom + PRESENT_ENDINGS['1sg'][1]),
-            '1pl': (stem_ps + PRESENT_ENDINGS['1pl'][0], stem_rom + PRESENT_ENDINGS['1pl'][1]),
-            '2sg': (stem_ps + PRESENT_ENDINGS['2sg'][0], stem_rom + PRESENT_ENDINGS['2sg'][1]),
-            '2pl': (stem_ps + PRESENT_ENDINGS['2pl'][0], stem_rom + PRESENT_ENDINGS['2pl'][1]),
-            '3sg': (stem_ps + PRESENT_ENDINGS['3sg'][0], stem_rom + PRESENT_ENDINGS['3sg'][1]),
-            '3pl': (stem_ps + PRESENT_ENDINGS['3pl'][0], stem_rom + PRESENT_ENDINGS['3pl'][1]),
-        }
-
-    def build_past(stem_ps, stem_rom):
-        return {
-            '1sg': (stem_ps + PAST_ENDINGS['1sg'][0], stem_rom + PAST_ENDINGS['1sg'][1]),
-            '1pl': (stem_ps + PAST_ENDINGS['1pl'][0], stem_rom + PAST_ENDINGS['1pl'][1]),
-            '2sg': (stem_ps + PAST_ENDINGS['2sg'][0], stem_rom + PAST_ENDINGS['2sg'][1]),
-            '2pl': (stem_ps + PAST_ENDINGS['2pl'][0], stem_rom + PAST_ENDINGS['2pl'][1]),
-            '3sg_m': (stem_ps + PAST_ENDINGS['3sg_m'][0], stem_rom + PAST_ENDINGS['3sg_m'][1]),
-            '3sg_f': (stem_ps + PAST_ENDINGS['3sg_f'][0], stem_rom + PAST_ENDINGS['3sg_f'][1]),
-            '3pl': (stem_ps + PAST_ENDINGS['3pl'][0], stem_rom + PAST_ENDINGS['3pl'][1]),
-        }
-
-    present = build_present(imperfective_stem, v['romanization']['imperfective_stem'])
-    subjunctive = build_present(perfective_stem, v['romanization']['perfective_stem'])
+    rom = v['romanization']
+
+    present = _build(imperfective_stem, rom['imperfective_stem'], PRESENT_ENDINGS)
+    subjunctive = _build(perfective_stem, rom['perfective_stem'], PRESENT_ENDINGS)
 
     # Continuous past uses imperfective root + past endings
-    cont_past = build_past(v['roots']['imperfective'], v['romanization']['imperfective_root'])
+    cont_past = _build(imperfective_root, rom['imperfective_root'], PAST_ENDINGS)
     # Simple past uses perfective root + past endings
-    simple_past = build_past(v['roots']['perfective'], v['romanization']['perfective_root'])
+    simple_past = _build(perfective_root, rom['perfective_root'], PAST_ENDINGS)
 
     # Map Pashto forms to romanization for quick override in UI
     forms_map = {
-        imperfective_root: v['romanization']['imperfective_root'],
-        perfective_root: v['romanization']['perfective_root'],
-        past_participle: v['romanization']['past_participle'],
+        imperfective_root: rom['imperfective_root'],
+        perfective_root: rom['perfective_root'],
+        past_participle: rom['past_participle'],
     }
     for d in (present, subjunctive, cont_past, simple_past):
-        for _, (ps, rom) in d.items():
-            forms_map[ps] = rom
+        # Each cell is already a (ps, rom) pair
+        forms_map.update(d.values())
 
     return {
         'meta': {
@@ -101,7 +94,7 @@ def conjugate_verb(root: str) -> Dict[str, Any]:
             'imperfective_root': imperfective_root,
             'perfective_root': perfective_root,
             'past_participle': past_participle,
-            'romanization': v['romanization'],
+            'romanization': rom,
         },
         'present': present,
         'subjunctive': subjunctive,
@@ -111,10 +104,12 @@ def conjugate_verb(root: str) -> Dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=1)
 def build_forms_root_index() -> Dict[str, str]:
     """Build a mapping from Pashto conjugated form -> canonical verb root using the lexicon.
 
     This is used to recognize when a searched form like "وینم" belongs to the verb "لیدل".
+    Built once, on first use; read-only.
     """
     index: Dict[str, str] = {}
     for root in VERBS.keys():